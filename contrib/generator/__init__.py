@@ -3,4 +3,5 @@ from typing import Sequence
 
 from sqlalchemy import Engine, MetaData
 
-from .sqlmodel import SQLModelGenerator
+from .cache import SchemaCache
+from .sqlmodel import SQLModelGenerator, TypeRegistry, type_registry
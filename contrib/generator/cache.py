@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+import sqlalchemy
+from sqlalchemy import text
+
+from core.config.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Cheap catalog queries whose result changes whenever tables, columns, keys or indexes change.
+_FINGERPRINT_QUERIES = {
+    "sqlite": [
+        "SELECT type, name, tbl_name, sql FROM sqlite_master ORDER BY type, name",
+    ],
+    "mysql": [
+        "SELECT TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT "
+        "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, ORDINAL_POSITION",
+        "SELECT TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME, NON_UNIQUE "
+        "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+        "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX",
+        "SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+        "FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE() "
+        "ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION",
+    ],
+    "postgresql": [
+        "SELECT c.relname, a.attnum, a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull "
+        "FROM pg_attribute a JOIN pg_class c ON c.oid = a.attrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p', 'v', 'm') "
+        "AND a.attnum > 0 AND NOT a.attisdropped ORDER BY c.relname, a.attnum",
+        "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE connamespace = current_schema()::regnamespace ORDER BY 1, 2",
+        "SELECT tablename, indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() ORDER BY tablename, indexname",
+    ],
+}
+
+
+class SchemaCache:
+    def __init__(self, directory: str = CACHE_DIR) -> None:
+        """
+        Persists reflected MetaData on disk, keyed by connection URL.
+
+        An entry is only reused while the schema fingerprint, a hash of a few
+        catalog queries, is unchanged.
+
+        Args:
+            directory: Directory holding the cache files.
+        """
+        self.directory = directory
+
+    def path(self, engine: sqlalchemy.Engine) -> str:
+        url = engine.url.render_as_string(hide_password=False)
+        return os.path.join(self.directory, f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.schema")
+
+    def fingerprint(self, engine: sqlalchemy.Engine) -> Optional[str]:
+        """
+        Computes the schema fingerprint of a database.
+
+        Returns:
+            The fingerprint, or None if the dialect has no fingerprint queries.
+        """
+        queries = _FINGERPRINT_QUERIES.get(engine.dialect.name)
+        if not queries:
+            return None
+        digest = hashlib.sha256()
+        with engine.connect() as connection:
+            for query in queries:
+                for row in connection.execute(text(query)):
+                    digest.update(repr(tuple(row)).encode())
+        return digest.hexdigest()
+
+    def load(self, engine: sqlalchemy.Engine, metadata: sqlalchemy.MetaData, fingerprint: Optional[str]) -> bool:
+        """
+        Copies the cached tables into ``metadata`` if the fingerprint still matches.
+
+        Returns:
+            True on a cache hit.
+        """
+        path = self.path(engine)
+        if fingerprint is None or not os.path.isfile(path):
+            return False
+        try:
+            with open(path, mode="rb") as file:
+                cached_fingerprint, cached = pickle.load(file)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable schema cache {path}: {e}")
+            return False
+        if cached_fingerprint != fingerprint:
+            return False
+        for table in cached.sorted_tables:
+            if table.key not in metadata.tables:
+                table.to_metadata(metadata)
+        return True
+
+    def store(self, engine: sqlalchemy.Engine, metadata: sqlalchemy.MetaData, fingerprint: Optional[str]) -> None:
+        if fingerprint is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(engine)
+        # Write a private temp file then rename, so concurrent writers (threads included)
+        # never share a file and readers never see a partial one.
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+            try:
+                pickle.dump((fingerprint, metadata), file)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, path)
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
-import uuid
+import hashlib
+import os
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Union
+from fnmatch import fnmatchcase
+from threading import Lock
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import sqlalchemy
+from sqlalchemy.dialects import mysql, postgresql
 from slugify import slugify
 from sqlmodel import Table
 
+from .cache import SchemaCache
+
 _CONVERT_DATA = {
     "int": [
         sqlalchemy.types.INTEGER,
@@ -59,12 +67,104 @@ _CONVERT_DATA = {
     "datetime.timedelta": [sqlalchemy.types.Interval],
     "list": [sqlalchemy.types.ARRAY],
     "dict": [sqlalchemy.types.JSON],
-    "uuid": [uuid.UUID],
+    "uuid.UUID": [sqlalchemy.types.Uuid],
+}
+
+# Dialect types which don't inherit from a generic type above.
+_DIALECT_CONVERT_DATA = {
+    "postgresql": {
+        "dict": [postgresql.HSTORE],
+        "datetime.timedelta": [postgresql.INTERVAL],
+        "str": [
+            postgresql.INET,
+            postgresql.CIDR,
+            postgresql.MACADDR,
+            postgresql.MONEY,
+            postgresql.TSVECTOR,
+            postgresql.BIT,
+        ],
+        "int": [postgresql.OID, postgresql.REGCLASS],
+    },
+    "mysql": {
+        "int": [mysql.YEAR, mysql.BIT],
+    },
+}
+
+# Container types SQLModel can't infer from a dict/list annotation, rendered as an explicit sa_type.
+_SA_TYPES = {
+    postgresql.JSONB: "postgresql.JSONB",
+    postgresql.HSTORE: "postgresql.HSTORE",
+    sqlalchemy.types.JSON: "sqlalchemy.JSON",
 }
 
+
+def sa_type_of(datatype: Any) -> Optional[str]:
+    """Returns the SQLAlchemy type expression to declare for JSON, JSONB, HSTORE and ARRAY columns, else None."""
+    if isinstance(datatype, sqlalchemy.types.ARRAY):
+        try:
+            item = type(datatype.item_type.as_generic()).__name__
+        except NotImplementedError:
+            item = "String"
+        if not hasattr(sqlalchemy, item) or item == "ARRAY":
+            item = "String"
+        dimensions = f", dimensions={datatype.dimensions}" if datatype.dimensions else ""
+        return f"sqlalchemy.ARRAY(sqlalchemy.{item}{dimensions})"
+    return next((expression for klass, expression in _SA_TYPES.items() if isinstance(datatype, klass)), None)
+
+
+# Modules built in memory, keyed by name, file and the hash of their source, so rebuilding an unchanged schema is free.
+_MODULES: Dict[Tuple[str, str, str], ModuleType] = {}
+_MODULES_LOCK = Lock()
+
+
+class TypeRegistry:
+    def __init__(self, data: Dict[str, Iterable[type]], fallback: Optional[str] = "str") -> None:
+        """
+        Maps SQLAlchemy type classes to Python type annotations.
+
+        A type resolves to the closest registered class in its MRO. The MRO is
+        walked once per SQL type class and the result memoized.
+
+        Args:
+            data: Mapping of Python type annotation to SQLAlchemy type classes.
+            fallback: Annotation used for unknown types, or None to raise LookupError.
+        """
+        self.fallback = fallback
+        self._types: Dict[type, str] = {}
+        self._cache: Dict[type, Optional[str]] = {}
+        self.update(data)
+
+    def register(self, sqltype: type, pytype: str) -> None:
+        self._types[sqltype] = pytype
+        self._cache.clear()
+
+    def update(self, data: Dict[str, Iterable[type]]) -> None:
+        for pytype, sqltypes in data.items():
+            for sqltype in sqltypes:
+                self.register(sqltype, pytype)
+
+    def lookup(self, datatype: Any) -> str:
+        cls = datatype if isinstance(datatype, type) else type(datatype)
+        try:
+            pytype = self._cache[cls]
+        except KeyError:
+            pytype = next((self._types[klass] for klass in cls.__mro__ if klass in self._types), None)
+            self._cache[cls] = pytype
+        if pytype is not None:
+            return pytype
+        if self.fallback is None:
+            raise LookupError(f"No Python type registered for {cls.__name__}")
+        return self.fallback
+
+
+type_registry = TypeRegistry(_CONVERT_DATA)
+for _dialect_data in _DIALECT_CONVERT_DATA.values():
+    type_registry.update(_dialect_data)
+
+
 # fmt: off
-def convert(datatype: type) -> str:
-    return next(pytype for pytype, sqltypes in _CONVERT_DATA.items() if any(isinstance(datatype, sqltype) for sqltype in sqltypes))
+def convert(datatype: Any, registry: Optional[TypeRegistry] = None) -> str:
+    return (registry or type_registry).lookup(datatype)
 
 # fmt: off
 def convert_table_name(name: str) -> str:
@@ -81,6 +181,8 @@ class ColumnD:
     column_type: Union[str, Any]
     primary_key: bool = False
     nullable: bool = True
+    # Explicit SQLAlchemy type for columns whose annotation doesn't map to one (JSON, ARRAY, ...).
+    sa_type: Optional[str] = None
 
 
 @dataclass
@@ -96,12 +198,54 @@ class SQLModelGenerator:
     engine: sqlalchemy.Engine
     metadata: sqlalchemy.MetaData
 
+    schema_cache: Optional[SchemaCache] = field(default_factory=SchemaCache)
+    # Table names or glob patterns; tables referenced by foreign keys are reflected regardless.
+    include: Optional[List[str]] = None
+    exclude: Optional[List[str]] = None
+    # Reflect a table on first access instead of the whole selection up front.
+    lazy: bool = False
+    type_registry: Optional[TypeRegistry] = None
+
     _imports: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
     _module_imports: Set[str] = field(default_factory=set)
 
     def __post_init__(self):
-        self.metadata.reflect(self.engine)
-        self.tables: List[Table] = self.metadata.sorted_tables
+        self._reflected = False
+        if not self.lazy:
+            self.reflect()
+
+    def selects(self, name: str, *_: Any) -> bool:
+        if self.include and not any(fnmatchcase(name, pattern) for pattern in self.include):
+            return False
+        return not (self.exclude and any(fnmatchcase(name, pattern) for pattern in self.exclude))
+
+    def reflect(self) -> None:
+        """Reflects the selected tables, or loads the schema cache while the schema fingerprint is unchanged."""
+        only = self.selects if self.include or self.exclude else None
+        if self.schema_cache is None:
+            self.metadata.reflect(self.engine, only=only)
+        else:
+            fingerprint = self.schema_cache.fingerprint(self.engine)
+            if fingerprint is not None and only is not None:
+                fingerprint += f":{sorted(self.include or [])}:{sorted(self.exclude or [])}"
+            if not self.schema_cache.load(self.engine, self.metadata, fingerprint):
+                self.metadata.reflect(self.engine, only=only)
+                self.schema_cache.store(self.engine, self.metadata, fingerprint)
+        self._reflected = True
+
+    def get_table(self, name: str) -> Table:
+        """Returns a selected table, reflecting only that table if it isn't known yet."""
+        if not self.selects(name):
+            raise LookupError(f"Table {name!r} is excluded from generation")
+        if name not in self.metadata.tables:
+            Table(name, self.metadata, autoload_with=self.engine)
+        return self.metadata.tables[name]
+
+    @property
+    def tables(self) -> List[Table]:
+        if not self._reflected:
+            self.reflect()
+        return [table for table in self.metadata.sorted_tables if self.selects(table.name)]
 
     def add_import(self, pkgname: str, name: str | List[str]) -> None:
         names = self._imports.setdefault(pkgname, set())
@@ -116,7 +260,7 @@ class SQLModelGenerator:
     def generate_model(self, table: Table) -> TableD:
         default_primary_key = ColumnD(name="index", column_type="int", primary_key=True, nullable=True)
         table_d_columns = [default_primary_key] if not any([col.primary_key for col in table.columns]) else []
-        table_d_columns += [ColumnD(convert_column_name(col.name), convert(col.type), col.primary_key, col.nullable) for col in table.columns] #type: ignore
+        table_d_columns += [ColumnD(convert_column_name(col.name), convert(col.type, self.type_registry), col.primary_key, col.nullable, sa_type_of(col.type)) for col in table.columns] #type: ignore
         return TableD(name=table.name, columns=table_d_columns)
 
     def generate_sqlmodel(self, table_d: TableD) -> str:
@@ -125,11 +269,21 @@ class SQLModelGenerator:
         self.add_module_import("datetime") 
         self.add_module_import("decimal")  
 
-        class_definition = f"class {convert_table_name(table_d.name)}(SQLModel, table=True):\n"
+        class_definition = f"class {convert_table_name(table_d.name)}(_Base, table=True):\n"
         class_definition += f'\t__table_name__ = "{table_d.name}"\n\n'
         for column in table_d.columns: #type: ignore
+            if "." in column.column_type:
+                self.add_module_import(column.column_type.split(".")[0])
+            if column.sa_type:
+                self.add_module_import("sqlalchemy")
+                if column.sa_type.startswith("postgresql."):
+                    self.add_import("sqlalchemy.dialects", "postgresql")
             if column.primary_key:
                 class_definition += f"\t{column.name}: Optional[{column.column_type}] = Field(primary_key=True)\n"
+            elif column.sa_type:
+                annotation = f"Optional[{column.column_type}]" if column.nullable else column.column_type
+                default = "default=None, " if column.nullable else ""
+                class_definition += f"\t{column.name}: {annotation} = Field({default}sa_type={column.sa_type})\n"
             elif column.nullable:
                 class_definition += f"\t{column.name}: Optional[{column.column_type}] = None\n"
             else:
@@ -137,15 +291,66 @@ class SQLModelGenerator:
         class_definition += "\n"
         return class_definition
 
-    def generate(self):
-        all_data = "\n" + "".join(self.generate_sqlmodel(self.generate_model(table)) for table in self.metadata.sorted_tables)
+    def render(self) -> str:
+        """Returns the source code of the models module."""
+        # Every module gets its own registry, so blocks sharing table names can coexist in one process.
+        self.add_import("sqlalchemy.orm", "registry")
+        self.add_import("sqlmodel", "SQLModel")
+        all_data = "\n" + "class _Base(SQLModel, registry=registry()):\n\tpass\n\n\n"
+        all_data += "".join(self.generate_sqlmodel(self.generate_model(table)) for table in self.tables)
         all_data += f"\nALL_TABLES = [{', '.join(self.table_names)}]"
 
-        import_data = "".join(f"from {pkgname} import {', '.join(name)}\n" for pkgname, name in self._imports.items())
-        import_data += "".join(f"import {name}\n" for name in self._module_imports)
-        
+        # Sorted so identical schemas always produce identical files.
+        import_data = "".join(f"from {pkgname} import {', '.join(sorted(name))}\n" for pkgname, name in sorted(self._imports.items()))
+        import_data += "".join(f"import {name}\n" for name in sorted(self._module_imports))
+        return import_data + "\n" + all_data
+
+    def generate(self) -> bool:
+        """Writes the models module, unless the file already has the exact same content.
+
+        Returns:
+            True if the file was (re)written.
+        """
+        content = self.render()
+        if os.path.isfile(self.outfile):
+            with open(self.outfile, mode="r", encoding="utf-8") as file:
+                if file.read() == content:
+                    return False
         with open(self.outfile, mode="w", encoding="utf-8") as file:
-            file.write(import_data + "\n" + all_data)
+            file.write(content)
+        return True
+
+    def build_module(self, name: str, register: bool = True) -> ModuleType:
+        """Builds the models module in memory, without writing or importing a file.
+
+        Args:
+            name: The module name, e.g. ``src.src``.
+            register: Also register the module in ``sys.modules`` so ``import name`` returns it.
+
+        Returns:
+            The module holding the model classes and ``ALL_TABLES``.
+        """
+        content = self.render()
+        key = (name, self.outfile, hashlib.sha256(content.encode()).hexdigest())
+        with _MODULES_LOCK:
+            module = _MODULES.get(key)
+            if module is None:
+                module = ModuleType(name)
+                module.__file__ = self.outfile
+                # The classes resolve their module through sys.modules while being created.
+                previous = sys.modules.get(name)
+                sys.modules[name] = module
+                try:
+                    exec(compile(content, self.outfile, "exec"), module.__dict__)
+                finally:
+                    if previous is None:
+                        del sys.modules[name]
+                    else:
+                        sys.modules[name] = previous
+                _MODULES[key] = module
+            if register:
+                sys.modules[name] = module
+        return module
 
     @property
     def table_names(self) -> List[str]:
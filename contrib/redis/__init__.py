@@ -1 +1,3 @@
-from .redis import RedisStore
+from .aio import AsyncRedisStore
+from .codecs import CODECS, COMPRESSIONS, Codec, Serializer
+from .redis import BaseRedisStore, RedisStore
@@ -0,0 +1,142 @@
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional
+
+from redis.asyncio import StrictRedis
+
+from .codecs import Serializer
+from .redis import BaseRedisStore
+
+
+class AsyncRedisStore(BaseRedisStore):
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "",
+        ttl: Optional[int] = None,
+        batch_size: int = 1000,
+        scan_count: int = 1000,
+        indexed: bool = False,
+        serializer: Optional[Serializer] = None,
+    ):
+        """
+        RedisStore for asyncio code, over ``redis.asyncio``, so lookups never block the event loop.
+
+        Keys and values are interchangeable with a RedisStore using the same
+        prefix. Mapping operations are coroutines (``await store.get(key)``) and
+        keys are iterated with ``async for``.
+
+        Args:
+            redis_url: The URL of the Redis server.
+            key_prefix: Optional prefix for all keys stored in Redis.
+            ttl: Optional default expiry of written keys, in seconds.
+            batch_size: Maximum number of keys sent in one command by the batched methods.
+            scan_count: ``COUNT`` hint of each ``SCAN`` call when iterating keys.
+            indexed: Keep the keys in a Redis set for an O(1) ``length()``, see RedisStore.
+            serializer: Codec and compression of values. Defaults to orjson, uncompressed.
+        """
+        super().__init__(key_prefix, ttl, batch_size, scan_count, indexed, serializer)
+        self.redis = StrictRedis.from_url(redis_url)
+
+    async def __aenter__(self) -> "AsyncRedisStore":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    async def get(self, key, default_value=None):
+        """
+        Gets the value associated with the given key.
+
+        Returns:
+            The value associated with the key, or default_value if the key does not exist.
+        """
+        data = await self.redis.get(self._get_full_key(key))
+        return self.serializer.decode(data) if data is not None else default_value
+
+    async def set(self, key, value, ttl: Optional[int] = None):
+        ttl = self._check_ttl(ttl)
+        data = self.serializer.encode(value)
+        if self.indexed:
+            await self.redis.pipeline().set(self._get_full_key(key), data).sadd(self.index_key, key).execute()
+        else:
+            await self.redis.set(self._get_full_key(key), data, ex=ttl)
+
+    async def delete(self, key):
+        if self.indexed:
+            await self.redis.pipeline().delete(self._get_full_key(key)).srem(self.index_key, key).execute()
+        else:
+            await self.redis.delete(self._get_full_key(key))
+
+    async def contains(self, key) -> bool:
+        return bool(await self.redis.exists(self._get_full_key(key)))
+
+    async def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Gets many values in one round-trip, see RedisStore.get_many."""
+        keys = list(keys)
+        pipeline = self.redis.pipeline(transaction=False)
+        for batch in self._batches(keys):
+            pipeline.mget([self._get_full_key(key) for key in batch])
+        values = [value for batch in await pipeline.execute() for value in batch]
+        return {key: self.serializer.decode(value) for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, mapping: Mapping[Any, Any], ttl: Optional[int] = None):
+        """Sets many values in one round-trip, see RedisStore.set_many."""
+        ttl = self._check_ttl(ttl)
+        pipeline = self.redis.pipeline(transaction=self.indexed)
+        for batch in self._batches(list(mapping.items())):
+            if ttl:
+                for key, value in batch:
+                    pipeline.set(self._get_full_key(key), self.serializer.encode(value), ex=ttl)
+            else:
+                pipeline.mset({self._get_full_key(key): self.serializer.encode(value) for key, value in batch})
+            if self.indexed:
+                pipeline.sadd(self.index_key, *[key for key, _ in batch])
+        await pipeline.execute()
+
+    async def delete_many(self, keys: Iterable[Any]) -> int:
+        """Deletes many keys in one round-trip, see RedisStore.delete_many."""
+        pipeline = self.redis.pipeline(transaction=self.indexed)
+        for batch in self._batches(list(keys)):
+            pipeline.delete(*[self._get_full_key(key) for key in batch])
+            if self.indexed:
+                pipeline.srem(self.index_key, *batch)
+        results = await pipeline.execute()
+        return sum(results[::2] if self.indexed else results)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self.indexed:
+            async for key in self.redis.sscan_iter(self.index_key, count=self.scan_count):
+                yield key.decode()
+            return
+        async for key in self.redis.scan_iter(match=self.pattern, count=self.scan_count):
+            key = key.decode()
+            if key != self.index_key:
+                yield key[len(self.key_prefix):]
+
+    async def items(self) -> AsyncIterator[tuple]:
+        """Iterates over the key-value pairs, fetching values one batch of keys at a time."""
+        batch = []
+        async for key in self:
+            batch.append(key)
+            if len(batch) >= self.batch_size:
+                for item in (await self.get_many(batch)).items():
+                    yield item
+                batch = []
+        if batch:
+            for item in (await self.get_many(batch)).items():
+                yield item
+
+    async def length(self) -> int:
+        """
+        Returns the number of key-value pairs in the store.
+
+        This scans the whole keyspace unless the store is indexed.
+        """
+        if self.indexed:
+            return await self.redis.scard(self.index_key)
+        count = 0
+        async for _ in self:
+            count += 1
+        return count
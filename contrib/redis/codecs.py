@@ -0,0 +1,114 @@
+import lzma
+import pickle
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    tag: int
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _raw_dumps(value: Any) -> bytes:
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        raise TypeError(f"The raw codec only stores bytes, not {type(value).__name__}")
+    return bytes(value)
+
+
+CODECS: Dict[str, Codec] = {
+    "orjson": Codec("orjson", 1, orjson.dumps, orjson.loads),
+    "pickle": Codec("pickle", 3, lambda value: pickle.dumps(value, protocol=5), pickle.loads),
+    "raw": Codec("raw", 4, _raw_dumps, bytes),
+}
+if msgpack is not None:
+    CODECS["msgpack"] = Codec("msgpack", 2, msgpack.packb, msgpack.unpackb)
+
+# Compressors, as (tag, compress, decompress). Tags live in bits 3-4 of the header byte.
+COMPRESSIONS = {
+    "zlib": (1 << 3, zlib.compress, zlib.decompress),
+    "lzma": (2 << 3, lzma.compress, lzma.decompress),
+}
+
+_CODEC_TAGS = {codec.tag: codec for codec in CODECS.values()}
+_DECOMPRESSORS = {tag: decompress for tag, _, decompress in COMPRESSIONS.values()}
+
+
+class Serializer:
+    def __init__(
+        self,
+        codec: str = "orjson",
+        compression: Optional[str] = None,
+        threshold: int = 1024,
+        accept: Optional[Iterable[str]] = None,
+    ):
+        """
+        Encodes values for Redis as one header byte followed by the payload.
+
+        The header records the codec and the compression of every value, so a
+        store can change codec and still read what it wrote before, if the old
+        codec is listed in ``accept``. Values are only decoded with an accepted
+        codec: a header is never trusted to pick pickle, as anyone who can write
+        to Redis could then run code in the reader. Headers are control
+        characters, which orjson never starts with, so values written before
+        headers existed are still read as orjson when orjson is accepted.
+
+        Args:
+            codec: One of ``orjson``, ``msgpack`` (needs the msgpack package),
+                ``pickle`` (protocol 5) or ``raw`` (bytes as they are).
+            compression: ``zlib`` or ``lzma`` to compress payloads above the threshold.
+            threshold: Payloads smaller than this many bytes are stored uncompressed.
+            accept: Codecs values may be decoded with. Defaults to the codec alone.
+        """
+        accept = {codec, *(accept or ())}
+        for name in accept:
+            if name not in CODECS:
+                hint = " (pip install msgpack)" if name == "msgpack" else ""
+                raise ValueError(f"Unknown codec {name!r}{hint}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}")
+        self.codec = CODECS[codec]
+        self.compression = compression
+        self.threshold = threshold
+        self.accept = {CODECS[name].tag: CODECS[name] for name in accept}
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.codec.dumps(value)
+        header = self.codec.tag
+        if self.compression is not None and len(payload) >= self.threshold:
+            tag, compress, _ = COMPRESSIONS[self.compression]
+            compressed = compress(payload)
+            if len(compressed) < len(payload):
+                header, payload = header | tag, compressed
+        return bytes((header,)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        if not data or data[0] >= 0x20:
+            header = CODECS["orjson"].tag
+            if header not in self.accept:
+                raise ValueError("Value without a header, orjson is not an accepted codec")
+            return orjson.loads(data)
+        header = data[0]
+        codec = self.accept.get(header & 0b111)
+        if codec is None:
+            known = _CODEC_TAGS.get(header & 0b111)
+            if known is None:
+                raise ValueError(f"Unknown codec in header {header:#04x}")
+            raise ValueError(f"Codec {known.name!r} is not accepted by this serializer")
+        payload = data[1:]
+        if header & 0b11000:
+            decompress = _DECOMPRESSORS.get(header & 0b11000)
+            if decompress is None:
+                raise ValueError(f"Unknown compression in header {header:#04x}")
+            payload = decompress(payload)
+        return codec.loads(payload)
@@ -1,22 +1,93 @@
+import re
 from collections.abc import MutableMapping
-from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
 
-from orjson import dumps, loads
 from redis import StrictRedis
 
+from .codecs import Serializer
 
-class RedisStore(MutableMapping):
-    def __init__(self, redis_url: str, key_prefix: str = ""):
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+class BaseRedisStore:
+    def __init__(
+        self,
+        key_prefix: str = "",
+        ttl: Optional[int] = None,
+        batch_size: int = 1000,
+        scan_count: int = 1000,
+        indexed: bool = False,
+        serializer: Optional[Serializer] = None,
+    ):
+        """Keyspace options shared by the sync and async stores, see RedisStore."""
+        if indexed and ttl:
+            raise ValueError("An indexed RedisStore can't expire keys")
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.scan_count = scan_count
+        self.indexed = indexed
+        self.index_key = f"__index__:{key_prefix}"
+        self.serializer = serializer or Serializer()
+
+    @property
+    def pattern(self) -> str:
+        return _GLOB_SPECIAL.sub(r"\\\1", self.key_prefix) + "*"
+
+    def _check_ttl(self, ttl: Optional[int]) -> Optional[int]:
+        ttl = ttl or self.ttl
+        if ttl and self.indexed:
+            raise ValueError("An indexed RedisStore can't expire keys")
+        return ttl
+
+    def _batches(self, items: List[Any]) -> Iterable[List[Any]]:
+        for start in range(0, len(items), self.batch_size):
+            yield items[start : start + self.batch_size]
+
+    def _get_full_key(self, key):
+        """
+        Returns the full key with the prefix appended.
+
+        Args:
+            key: The key.
+
+        Returns:
+            The full key.
+        """
+        return f"{self.key_prefix}{key}"
+
+
+class RedisStore(BaseRedisStore, MutableMapping):
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "",
+        ttl: Optional[int] = None,
+        batch_size: int = 1000,
+        scan_count: int = 1000,
+        indexed: bool = False,
+        serializer: Optional[Serializer] = None,
+    ):
         """
         Initializes the RedisStore object.
 
+        The client's connection pool is thread-safe, so the store can be shared
+        between threads without locking.
+
         Args:
             redis_url: The URL of the Redis server.
             key_prefix: Optional prefix for all keys stored in Redis.
+            ttl: Optional default expiry of written keys, in seconds.
+            batch_size: Maximum number of keys sent in one command by the batched methods.
+            scan_count: ``COUNT`` hint of each ``SCAN`` call when iterating keys.
+            indexed: Keep the keys of the store in a Redis set, written in the same
+                transaction as the values, so ``len()`` is a single ``SCARD`` and
+                iteration only scans this store's keys. Not compatible with ttl, since
+                expired keys would stay in the index.
+            serializer: Codec and compression of values. Defaults to orjson, uncompressed.
         """
+        super().__init__(key_prefix, ttl, batch_size, scan_count, indexed, serializer)
         self.redis = StrictRedis.from_url(redis_url)
-        self.key_prefix = key_prefix
-        self._lock = Lock()
 
     def __getitem__(self, key, default_value=None):
         """
@@ -30,7 +101,7 @@ class RedisStore(MutableMapping):
         """
         key = self._get_full_key(key)
         data = self.redis.get(key)
-        return loads(data) if data else default_value
+        return self.serializer.decode(data) if data is not None else default_value
 
     def __setitem__(self, key, value):
         """
@@ -40,10 +111,7 @@ class RedisStore(MutableMapping):
             key: The key to set.
             value: The value to associate with the key.
         """
-        with self._lock:
-            key = self._get_full_key(key)
-            value = dumps(value)
-            self.redis.set(key, value)
+        self.set(key, value)
 
     def __delitem__(self, key):
         """
@@ -52,9 +120,83 @@ class RedisStore(MutableMapping):
         Args:
             key: The key to delete.
         """
-        with self._lock:
-            key = self._get_full_key(key)
-            self.redis.delete(key)
+        if self.indexed:
+            self.redis.pipeline().delete(self._get_full_key(key)).srem(self.index_key, key).execute()
+        else:
+            self.redis.delete(self._get_full_key(key))
+
+    def set(self, key, value, ttl: Optional[int] = None):
+        """
+        Sets the value associated with the given key, with an optional expiry.
+
+        Args:
+            key: The key to set.
+            value: The value to associate with the key.
+            ttl: Expiry in seconds. Defaults to the store's ttl.
+        """
+        ttl = self._check_ttl(ttl)
+        data = self.serializer.encode(value)
+        if self.indexed:
+            self.redis.pipeline().set(self._get_full_key(key), data).sadd(self.index_key, key).execute()
+        else:
+            self.redis.set(self._get_full_key(key), data, ex=ttl)
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """
+        Gets many values in one round-trip, with one ``MGET`` per batch.
+
+        Args:
+            keys: The keys to retrieve.
+
+        Returns:
+            A dict of the keys that exist and their values.
+        """
+        keys = list(keys)
+        pipeline = self.redis.pipeline(transaction=False)
+        for batch in self._batches(keys):
+            pipeline.mget([self._get_full_key(key) for key in batch])
+        values = [value for batch in pipeline.execute() for value in batch]
+        return {key: self.serializer.decode(value) for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, mapping: Mapping[Any, Any], ttl: Optional[int] = None):
+        """
+        Sets many values in one round-trip, with one ``MSET`` per batch, or
+        pipelined ``SET ... EX`` when the keys expire.
+
+        Args:
+            mapping: The keys and values to set.
+            ttl: Expiry in seconds. Defaults to the store's ttl.
+        """
+        ttl = self._check_ttl(ttl)
+        pipeline = self.redis.pipeline(transaction=self.indexed)
+        for batch in self._batches(list(mapping.items())):
+            if ttl:
+                for key, value in batch:
+                    pipeline.set(self._get_full_key(key), self.serializer.encode(value), ex=ttl)
+            else:
+                pipeline.mset({self._get_full_key(key): self.serializer.encode(value) for key, value in batch})
+            if self.indexed:
+                pipeline.sadd(self.index_key, *[key for key, _ in batch])
+        pipeline.execute()
+
+    def delete_many(self, keys: Iterable[Any]) -> int:
+        """
+        Deletes many keys in one round-trip.
+
+        Args:
+            keys: The keys to delete.
+
+        Returns:
+            The number of keys that existed.
+        """
+        pipeline = self.redis.pipeline(transaction=self.indexed)
+        for batch in self._batches(list(keys)):
+            pipeline.delete(*[self._get_full_key(key) for key in batch])
+            if self.indexed:
+                pipeline.srem(self.index_key, *batch)
+        results = pipeline.execute()
+        # Every other reply answers the SREM of the index.
+        return sum(results[::2] if self.indexed else results)
 
     def __iter__(self):
         """
@@ -63,28 +205,37 @@ class RedisStore(MutableMapping):
         Returns:
             An iterator of keys.
         """
-        pattern = self.key_prefix + "*"
-        for key in self.redis.scan(match=pattern):
-            yield key.decode()[len(self.key_prefix):]
+        return self.scan_iter()
 
-    def __len__(self):
+    def scan_iter(self, prefix: str = "") -> Iterator[str]:
         """
-        Returns the number of key-value pairs in the store.
+        Iterates over the keys starting with a prefix, letting Redis filter them with ``MATCH``.
+
+        Args:
+            prefix: The prefix of the keys, without the store's key_prefix.
 
         Returns:
-            The number of key-value pairs.
+            An iterator of keys.
         """
-        pattern = self.key_prefix + "*"
-        return len(list(self.redis.scan(match=pattern)))
+        match = _GLOB_SPECIAL.sub(r"\\\1", prefix) + "*"
+        if self.indexed:
+            for key in self.redis.sscan_iter(self.index_key, match=match, count=self.scan_count):
+                yield key.decode()
+            return
+        for key in self.redis.scan_iter(match=self.pattern[:-1] + match, count=self.scan_count):
+            key = key.decode()
+            if key != self.index_key:
+                yield key[len(self.key_prefix):]
 
-    def _get_full_key(self, key):
+    def __len__(self):
         """
-        Returns the full key with the prefix appended.
+        Returns the number of key-value pairs in the store.
 
-        Args:
-            key: The key.
+        This scans the whole keyspace unless the store is indexed.
 
         Returns:
-            The full key.
+            The number of key-value pairs.
         """
-        return f"{self.key_prefix}{key}"
+        if self.indexed:
+            return self.redis.scard(self.index_key)
+        return sum(1 for _ in self)
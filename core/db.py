@@ -20,6 +20,7 @@ def get_db() -> Generator:
         yield session
 
 
-def init_db(engine: Engine):
-    SQLModel.metadata.drop_all(marco_engine)
+def init_db(engine: Engine, drop_all: bool = True):
+    if drop_all:
+        SQLModel.metadata.drop_all(marco_engine)
     SQLModel.metadata.create_all(marco_engine)
@@ -1,15 +1,15 @@
-from sqlmodel import select
-
 from contrib import InitLogger
 from core import env
 from core.db import init_db, marco_engine
 from internal import MySQLConfig, SQLiteConfig
 from src.blocks import SQLBlock
+from src.migration import CheckpointStore, TableCopier
 
 
 def main():
     InitLogger()
-    init_db(marco_engine)
+    # Keep the marco database so copy checkpoints survive a restart.
+    init_db(marco_engine, drop_all=False)
     env.set("src", {"source_file": "src"})
     env.set("tar", {"source_file": "tar"})
     env.build()
@@ -37,21 +37,14 @@ if __name__ == "__main__":
     )
 
     with s_block as src, t_block as tar:
+        src_model = src.models
         try:
-            import importlib
-
-            src_model = importlib.import_module("src.src")
             tar.db.auto_migrate(src_model.ALL_TABLES)  # type:ignore
         except Exception as e:
             print(e)
 
-        all_customers = src.db.session.exec(select(src_model.Customers))  # type:ignore
-        for customer in all_customers:
-            customer_data = customer.model_dump()
-            if "id" in customer_data:
-                del customer_data["id"]
-            if "index" in customer_data:
-                del customer_data["index"]
-            print(customer_data)
-            tar.db.session.add(src_model.Customers(**customer_data))  # type:ignore
-        tar.db.session.commit()  # type:ignore
+        copier = TableCopier(
+            src, tar, batch_size=10_000, commit_every=10, checkpoints=CheckpointStore("customers-migration")
+        )
+        stats = copier.copy_table("customers", src_model.Customers)  # type:ignore
+        print(stats)
@@ -1,6 +1,19 @@
-from .databases import DatabaseConfig, DatabaseInterface, DBConfigType, DBInterfaceType
+from .databases import (
+    ASYNC_DRIVERS,
+    AsyncDatabaseInterface,
+    DatabaseConfig,
+    DatabaseInterface,
+    DBConfigType,
+    DBInterfaceType,
+    adispose_engines,
+    async_url,
+    dispose_engines,
+    get_async_engine,
+    get_engine,
+)
 from .databases import logger as db_logger
 from .mongo.mongo import Mongo, MongoConfig
-from .mysql.mysql import MySQL, MySQLConfig
-from .postgres.postgres import PostgresSQL, PostgresSQLConfig
-from .sqlite.sqlite import SQLite, SQLiteConfig
+from .mysql.mysql import AsyncMySQL, MySQL, MySQLConfig
+from .postgres.postgres import AsyncPostgresSQL, PostgresSQL, PostgresSQLConfig
+from .sqlite.sqlite import AsyncSQLite, SQLite, SQLiteConfig
+from .schema import create_tables, execute_ddl, tables_of
@@ -1,64 +1,226 @@
 import logging
-from contextlib import contextmanager
-from typing import Generator, Generic, List, TypeVar
+from asyncio import current_task
+from contextlib import asynccontextmanager, contextmanager
+from threading import Lock
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Generic, List, Optional, Tuple, TypeVar
 
-from sqlalchemy.engine import Engine
+from sqlalchemy import Table, make_url
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_scoped_session, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.schema import ExecutableDDLElement
 from sqlmodel import MetaData, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from internal.types.base import BaseSQLModel
 
+from .schema import create_tables, execute_ddl, tables_of
+
 DBConfigType = TypeVar("DBConfigType", bound="DatabaseConfig")
 DBInterfaceType = TypeVar("DBInterfaceType", bound="DatabaseInterface")
 logger = logging.getLogger(__name__)
 
+# Engines shared by every interface of the process, keyed by URL and engine options.
+_ENGINES: Dict[Tuple[str, str], Any] = {}
+_ENGINES_LOCK = Lock()
+
+# Default asyncio driver of each backend.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "aiomysql", "postgresql": "asyncpg"}
+
 
 class DatabaseConfig:
-    def __init__(self, database_uri: str, echo: bool = False, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        database_uri: str,
+        echo: bool = False,
+        connect_args: Optional[Dict[str, Any]] = None,
+        *args,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_pre_ping: bool = False,
+        pool_recycle: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        share_engine: bool = True,
+        **kwargs,
+    ) -> None:
+        """
+        Connection settings of a database.
+
+        Args:
+            database_uri: The SQLAlchemy URL.
+            echo: Log every statement.
+            connect_args: Extra arguments passed to the DBAPI ``connect()``.
+            pool_size: Number of connections kept open by the pool.
+            max_overflow: Connections allowed above pool_size under load.
+            pool_pre_ping: Test connections on checkout, to survive server restarts.
+            pool_recycle: Replace connections older than this many seconds,
+                e.g. below MySQL's ``wait_timeout``.
+            pool_timeout: Seconds to wait for a free connection before giving up.
+            share_engine: Reuse the process-wide engine of this URL and options
+                instead of opening a new pool. In-memory SQLite databases are never
+                shared, every engine gets its own database.
+        """
         self.database_uri: str = database_uri
         self.echo = echo
-        self.connect_args = kwargs.get("connect_args", None)
+        self.connect_args = connect_args if connect_args is not None else kwargs.get("connect_args", None)
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_pre_ping = pool_pre_ping
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.share_engine = share_engine
+
+    def engine_options(self) -> Dict[str, Any]:
+        """Returns the ``create_engine`` keyword arguments, leaving unset pool options to the dialect's pool."""
+        options: Dict[str, Any] = {"echo": self.echo, "pool_pre_ping": self.pool_pre_ping}
+        if self.connect_args:
+            options["connect_args"] = self.connect_args
+        for name in ("pool_size", "max_overflow", "pool_recycle", "pool_timeout"):
+            if getattr(self, name) is not None:
+                options[name] = getattr(self, name)
+        return options
+
+
+def get_engine(config: DatabaseConfig) -> Engine:
+    """
+    Returns the engine of a config, shared by every caller with the same URL
+    and options unless ``config.share_engine`` is off.
+    """
+    return _shared_engine(config, config.database_uri, create_engine)
+
+
+def async_url(database_uri: str | URL, driver: Optional[str] = None) -> URL:
+    """Returns the URL of a database with its asyncio driver, e.g. ``sqlite+aiosqlite``."""
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    driver = driver or ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No asyncio driver known for {backend}")
+    return url.set(drivername=f"{backend}+{driver}")
+
+
+def get_async_engine(config: DatabaseConfig, driver: Optional[str] = None) -> AsyncEngine:
+    """
+    Async variant of ``get_engine``. Pooled connections belong to the event loop
+    that opened them, so a shared async engine must only be used from one loop.
+    """
+    return _shared_engine(config, async_url(config.database_uri, driver), create_async_engine)
+
+
+def _is_memory_sqlite(url: str | URL) -> bool:
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _shared_engine(config: DatabaseConfig, url: str | URL, factory: Callable[..., Any]) -> Any:
+    options = config.engine_options()
+    if not getattr(config, "share_engine", True) or _is_memory_sqlite(url):
+        return factory(url, **options)
+    key = (str(url), repr(sorted(options.items())))
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = _ENGINES[key] = factory(url, **options)
+    return engine
+
+
+def dispose_engines() -> None:
+    """Closes the pools of every shared sync engine, e.g. at shutdown or after a fork."""
+    with _ENGINES_LOCK:
+        for key, engine in list(_ENGINES.items()):
+            if isinstance(engine, Engine):
+                engine.dispose()
+                del _ENGINES[key]
+
+
+async def adispose_engines() -> None:
+    """Closes the pools of every shared async engine."""
+    with _ENGINES_LOCK:
+        engines = [(key, engine) for key, engine in _ENGINES.items() if isinstance(engine, AsyncEngine)]
+        for key, _ in engines:
+            del _ENGINES[key]
+    for _, engine in engines:
+        await engine.dispose()
 
 
 class DatabaseInterface(Generic[DBConfigType]):
     def __init__(self, config: DBConfigType) -> None:
         self.config: DBConfigType = config
-        self.engine: Engine = create_engine(
-            self.config.database_uri,
-            echo=self.config.echo,
-        )
-        self.session: Session = Session(self.engine)
+        self.engine: Engine = get_engine(self.config)
+        self.session_factory = sessionmaker(self.engine, class_=Session)
+        self.scoped_session = scoped_session(self.session_factory)
         self.metadata = MetaData()
+        self.deferred_ddl: List[ExecutableDDLElement] = []
+
+    @property
+    def session(self) -> Session:
+        """The session of the calling thread, created on first use and kept until ``close()``."""
+        return self.scoped_session()
 
     @contextmanager
-    def get_session(self) -> Generator[Session, None, None]:
-        if not self.session:
-            self.session = Session(self.engine)
-        try:
-            yield self.session
-            self.session.commit()
-        except Exception as e:
-            logger.error("Database error: %s " % e)
-            self.session.rollback()
-            raise
-        finally:
-            self.session.close()
+    def get_session(self, bulk: bool = False) -> Generator[Session, None, None]:
+        """
+        Opens a new session for one unit of work, committed on success and closed on exit.
+
+        Args:
+            bulk: For data movement: objects stay readable after commit
+                (``expire_on_commit=False``) and queries don't flush pending objects.
+        """
+        options = {"expire_on_commit": False, "autoflush": False} if bulk else {}
+        with self.session_factory(**options) as session:
+            try:
+                yield session
+                session.commit()
+            except Exception as e:
+                logger.error("Database error: %s " % e)
+                session.rollback()
+                raise
 
     def __enter__(self, *args, **kwargs) -> "DatabaseInterface":
         return self
 
     def __exit__(self, exc_type, exc_value, traceback, *args, **kwargs):
-        if self.session:
-            self.session.close()
+        self.close()
 
-        if self.engine:
+    def close(self) -> None:
+        """Closes the session of the calling thread, and the engine unless it is shared with other interfaces."""
+        self.scoped_session.remove()
+
+        if self.engine and not getattr(self.config, "share_engine", True):
             self.engine.dispose()
 
     def auto_migrate(self, models: List[BaseSQLModel] | BaseSQLModel):
-        if isinstance(models, list):
-            for model in models:
-                model.__table__.create(self.engine)
-        else:
-            models.__table__.create(self.engine)
+        self.apply_schema(models, checkfirst=False)
+
+    def apply_schema(
+        self, models: List[BaseSQLModel] | BaseSQLModel, *, checkfirst: bool = True, defer: bool = False
+    ) -> List[Table]:
+        """
+        Creates the tables of many models, parents first, in a single transaction
+        where the dialect has transactional DDL (Postgres, SQLite). MySQL commits
+        every ``CREATE TABLE`` on its own, a failure leaves the tables before it.
+
+        Args:
+            models: SQLModel classes or Tables, in any order.
+            checkfirst: Skip tables which already exist.
+            defer: Leave indexes and foreign keys out until ``create_deferred()``,
+                typically called after the bulk load.
+
+        Returns:
+            The created tables.
+        """
+        with self.engine.begin() as connection:
+            created, deferred = create_tables(connection, tables_of(models), checkfirst=checkfirst, defer=defer)
+        self.deferred_ddl.extend(deferred)
+        return created
+
+    def create_deferred(self) -> None:
+        """Creates the indexes and foreign keys deferred by ``apply_schema``, in one transaction."""
+        with self.engine.begin() as connection:
+            execute_ddl(connection, self.deferred_ddl)
+        self.deferred_ddl = []
 
     def drop_tables(self, models: List[BaseSQLModel] | BaseSQLModel):
         if isinstance(models, list):
@@ -66,3 +228,78 @@ class DatabaseInterface(Generic[DBConfigType]):
                 model.__table__.drop(self.engine)
         else:
             models.__table__.drop(self.engine)
+
+
+class AsyncDatabaseInterface(Generic[DBConfigType]):
+    driver: Optional[str] = None
+
+    def __init__(self, config: DBConfigType, driver: Optional[str] = None) -> None:
+        """
+        Asyncio counterpart of DatabaseInterface, on ``create_async_engine``.
+
+        The asyncio drivers are optional dependencies, see ``requirements-async.txt``.
+
+        Args:
+            config: The same config as the sync interface, its URL gets the asyncio driver.
+            driver: The asyncio driver, e.g. ``asyncmy``. Defaults to the class driver.
+        """
+        self.config: DBConfigType = config
+        self.engine: AsyncEngine = get_async_engine(self.config, driver or self.driver)
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.scoped_session = async_scoped_session(self.session_factory, scopefunc=current_task)
+        self.metadata = MetaData()
+        self.deferred_ddl: List[ExecutableDDLElement] = []
+
+    @property
+    def session(self) -> AsyncSession:
+        """The session of the calling task, created on first use and kept until ``close()``."""
+        return self.scoped_session()
+
+    @asynccontextmanager
+    async def get_session(self, bulk: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """Opens a new session for one unit of work, see DatabaseInterface.get_session."""
+        async with self.session_factory(**({"autoflush": False} if bulk else {})) as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                logger.error("Database error: %s " % e)
+                await session.rollback()
+                raise
+
+    async def __aenter__(self) -> "AsyncDatabaseInterface":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the session of the calling task, and the engine unless it is shared with other interfaces."""
+        await self.scoped_session.remove()
+        if not getattr(self.config, "share_engine", True):
+            await self.engine.dispose()
+
+    async def auto_migrate(self, models: List[BaseSQLModel] | BaseSQLModel):
+        await self.apply_schema(models, checkfirst=False)
+
+    async def apply_schema(
+        self, models: List[BaseSQLModel] | BaseSQLModel, *, checkfirst: bool = True, defer: bool = False
+    ) -> List[Table]:
+        """Creates the tables of many models in one transaction, see DatabaseInterface.apply_schema."""
+        async with self.engine.begin() as connection:
+            created, deferred = await connection.run_sync(
+                create_tables, tables_of(models), checkfirst=checkfirst, defer=defer
+            )
+        self.deferred_ddl.extend(deferred)
+        return created
+
+    async def create_deferred(self) -> None:
+        async with self.engine.begin() as connection:
+            await connection.run_sync(execute_ddl, self.deferred_ddl)
+        self.deferred_ddl = []
+
+    async def drop_tables(self, models: List[BaseSQLModel] | BaseSQLModel):
+        models = models if isinstance(models, list) else [models]
+        async with self.engine.begin() as connection:
+            for model in models:
+                await connection.run_sync(model.__table__.drop)
@@ -3,7 +3,7 @@ from typing import List, Literal, Optional
 
 from sqlalchemy import URL, text
 
-from internal.databases.databases import DatabaseConfig, DatabaseInterface
+from internal.databases.databases import AsyncDatabaseInterface, DatabaseConfig, DatabaseInterface
 
 
 class MySQLConfig(DatabaseConfig):
@@ -45,6 +45,8 @@ class MySQLConfig(DatabaseConfig):
             setattr(self, "database_uri", kwargs.get("database_uri"))
         if not self.database_uri:
             raise ValueError("Incorrect database_uri")
+        kwargs.pop("database_uri", None)
+        super().__init__(self.database_uri, echo, *args, **kwargs)
 
     @property
     def database_url(self):
@@ -65,3 +67,13 @@ class MySQL(DatabaseInterface):
     def show_tables(self) -> Optional[List[str]]:
         tables = self.session.exec(text("SHOW TABLES;"))  # type: ignore
         return [table[0] for table in tables.fetchall()]
+
+
+class AsyncMySQL(AsyncDatabaseInterface):
+    # asyncmy works too, pass driver="asyncmy".
+    driver = "aiomysql"
+
+    async def show_tables(self) -> Optional[List[str]]:
+        async with self.engine.connect() as connection:
+            tables = await connection.execute(text("SHOW TABLES;"))
+            return [table[0] for table in tables.fetchall()]
@@ -3,7 +3,7 @@ from typing import Literal
 
 from sqlalchemy import URL
 
-from internal.databases.databases import DatabaseConfig, DatabaseInterface
+from internal.databases.databases import AsyncDatabaseInterface, DatabaseConfig, DatabaseInterface
 
 
 class PostgresSQLConfig(DatabaseConfig):
@@ -45,6 +45,8 @@ class PostgresSQLConfig(DatabaseConfig):
             setattr(self, "database_uri", kwargs.get("database_uri"))
         if not self.database_uri:
             raise ValueError("Incorrect database_uri")
+        kwargs.pop("database_uri", None)
+        super().__init__(self.database_uri, echo, *args, **kwargs)
 
     @property
     def database_url(self):
@@ -61,3 +63,7 @@ class PostgresSQLConfig(DatabaseConfig):
 class PostgresSQL(DatabaseInterface):
     def __init__(self, config: PostgresSQLConfig) -> None:
         super().__init__(config)
+
+
+class AsyncPostgresSQL(AsyncDatabaseInterface):
+    driver = "asyncpg"
@@ -0,0 +1,90 @@
+from typing import Any, Iterable, List, Tuple
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable, ExecutableDDLElement, sort_tables_and_constraints
+
+
+def tables_of(models: Iterable[Any] | Any) -> List[Table]:
+    """Returns the tables of SQLModel classes or Tables."""
+    if not isinstance(models, (list, tuple, set)):
+        models = [models]
+    return [model if isinstance(model, Table) else model.__table__ for model in models]
+
+
+def begin_ddl(connection: Connection) -> None:
+    """
+    Makes the DDL executed next part of the connection's transaction.
+
+    pysqlite (and aiosqlite on top of it) only opens a transaction before
+    DML, so ``CREATE TABLE`` otherwise autocommits and a failed schema change
+    is left half applied. An explicit ``BEGIN`` puts SQLite's DDL back in the
+    transaction; other dialects begin on their own.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    dbapi_connection = connection.connection.dbapi_connection
+    # The asyncio adapter wraps the driver connection.
+    driver_connection = getattr(dbapi_connection, "_connection", dbapi_connection)
+    if not getattr(driver_connection, "in_transaction", False):
+        connection.exec_driver_sql("BEGIN")
+
+
+def create_tables(
+    connection: Connection, tables: Iterable[Table], *, checkfirst: bool = True, defer: bool = False
+) -> Tuple[List[Table], List[ExecutableDDLElement]]:
+    """
+    Creates tables parents first, on one connection.
+
+    Foreign keys closing a cycle are added with ``ALTER TABLE`` once every
+    table exists. With ``defer``, indexes and (where the dialect can ``ALTER``)
+    foreign keys are not created but returned, to be executed after the
+    tables are loaded, which is much faster than maintaining them row by row.
+
+    Args:
+        connection: The connection, the caller owns the transaction.
+        tables: The tables to create, in any order.
+        checkfirst: Skip tables which already exist instead of failing.
+        defer: Return index and foreign key DDL instead of executing it.
+
+    Returns:
+        The created tables, and the deferred DDL.
+    """
+    begin_ddl(connection)
+    if checkfirst:
+        inspector = inspect(connection)
+        tables = [table for table in tables if not inspector.has_table(table.name, schema=table.schema)]
+    can_alter = connection.dialect.supports_alter
+    created: List[Table] = []
+    later: List[ExecutableDDLElement] = []
+    deferred: List[ExecutableDDLElement] = []
+    # Without ALTER (SQLite), every foreign key, even in a cycle, is declared inline.
+    filter_fn = None if can_alter else (lambda constraint: False)
+    for table, constraints in sort_tables_and_constraints(tables, filter_fn=filter_fn):
+        if table is None:
+            later.extend(AddConstraint(constraint) for constraint in constraints)
+            continue
+        inline = constraints
+        if defer and can_alter:
+            deferred.extend(AddConstraint(constraint) for constraint in constraints)
+            inline = []
+        connection.execute(CreateTable(table, include_foreign_key_constraints=inline))
+        indexes = [CreateIndex(index) for index in sorted(table.indexes, key=lambda index: index.name or "")]
+        if defer:
+            deferred.extend(indexes)
+        else:
+            for ddl in indexes:
+                connection.execute(ddl)
+        created.append(table)
+    if defer:
+        deferred.extend(later)
+    else:
+        for ddl in later:
+            connection.execute(ddl)
+    return created, deferred
+
+
+def execute_ddl(connection: Connection, statements: Iterable[ExecutableDDLElement]) -> None:
+    begin_ddl(connection)
+    for statement in statements:
+        connection.execute(statement)
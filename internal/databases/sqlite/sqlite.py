@@ -2,7 +2,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy import text
 
-from internal.databases.databases import DatabaseConfig, DatabaseInterface
+from internal.databases.databases import AsyncDatabaseInterface, DatabaseConfig, DatabaseInterface
 
 
 class SQLiteConfig(DatabaseConfig):
@@ -24,3 +24,12 @@ class SQLite(DatabaseInterface):
     def show_tables(self) -> Optional[List[str]]:
         tables = self.session.exec(text("SELECT name FROM sqlite_master WHERE type = 'table';"))  # type: ignore
         return [table[0] for table in tables.fetchall()]
+
+
+class AsyncSQLite(AsyncDatabaseInterface):
+    driver = "aiosqlite"
+
+    async def show_tables(self) -> Optional[List[str]]:
+        async with self.engine.connect() as connection:
+            tables = await connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table';"))
+            return [table[0] for table in tables.fetchall()]
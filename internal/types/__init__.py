@@ -7,6 +7,9 @@ from internal.types.base import (
     RelationshipAttribute,
     RelationshipType,
 )
+from internal.types.cache import IdentityCache
+from internal.types.dml import upsert
 from internal.types.mixin import ActiveRecordMixin
 from internal.types.models import SQLModelBase, SQLModelMixin
 from internal.types.process import Block, BlockType
+from internal.types.statements import StatementCache, statement_cache
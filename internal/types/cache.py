@@ -0,0 +1,184 @@
+import base64
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from decimal import Decimal
+from itertools import islice
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+from orjson import dumps, loads
+from sqlalchemy import LargeBinary
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    # Types orjson can't serialize natively; model_validate parses them back from text (bytes via _to_model).
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _to_model(model: type, data: Any) -> Any:
+    """Validates a cached row back into the model, restoring the types JSON lost."""
+    for column in model.__table__.columns:  # type: ignore
+        value = data.get(column.key)
+        if isinstance(value, str) and isinstance(column.type, LargeBinary):
+            data[column.key] = base64.b64decode(value)
+    return model.model_validate(data)  # type: ignore
+
+
+class IdentityCache:
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: Optional[float] = 300.0,
+        store: Optional[MutableMapping] = None,
+        key_prefix: str = "identity:",
+    ) -> None:
+        """
+        Read-through cache of rows by primary key, in front of ``one_by_id`` and ``first_by_field``.
+
+        Rows are kept as orjson in a local LRU with a TTL, and optionally in a
+        shared second tier such as ``contrib.redis.RedisStore``. Lookups by field
+        only cache the primary key of the row they found, and are checked against
+        the cached row before use. The mixin invalidates rows it saves or deletes.
+
+        Args:
+            maxsize: Maximum number of local entries.
+            ttl: Seconds a local entry stays valid, or None for no expiry.
+            store: Optional shared mapping used on local misses.
+            key_prefix: Prefix of every key, to share the store with other data.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = Lock()
+
+    def key(self, model: type, *parts: Any) -> str:
+        return ":".join([f"{self.key_prefix}{model.__tablename__}", *map(str, parts)])  # type: ignore
+
+    def load(self, session, model: type, id: Any) -> Optional[Any]:
+        """
+        Returns the cached row as an instance attached to the session, without querying the database.
+
+        Returns:
+            The instance, or None on a cache miss.
+        """
+        ident = identity_key(model, id)
+        obj = session.identity_map.get(ident)
+        if obj is not None:
+            return obj
+        data = self._get(self.key(model, *ident[1]))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        obj = _to_model(model, loads(data))
+        # Attach as a clean persistent instance, so it can be updated or deleted as if it was queried.
+        make_transient_to_detached(obj)
+        session.add(obj)
+        return obj
+
+    def load_by_field(self, session, model: type, field: str, value: Any) -> Optional[Any]:
+        data = self._get(self.key(model, field, value))
+        if data is None:
+            self.misses += 1
+            return None
+        obj = self.load(session, model, tuple(loads(data)))
+        if obj is None or getattr(obj, field) != value:
+            return None
+        return obj
+
+    def put(self, obj: Any, field: Optional[str] = None) -> None:
+        """Caches a row, and the field it was looked up by."""
+        model = type(obj)
+        id = model.__mapper__.primary_key_from_instance(obj)  # type: ignore
+        self._set(self.key(model, *id), dumps(obj.model_dump(), default=_default))
+        if field is not None:
+            self._set(self.key(model, field, getattr(obj, field)), dumps(id, default=_default))
+
+    def invalidate(self, obj: Any) -> None:
+        model = type(obj)
+        id = model.__mapper__.primary_key_from_instance(obj)  # type: ignore
+        self._delete(self.key(model, *id))
+
+    def clear(self, model: Optional[type] = None) -> None:
+        """Forgets every row of a model, or everything."""
+        prefix = self.key(model) if model is not None else self.key_prefix
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+        if self.store is None:
+            return
+        try:
+            if hasattr(self.store, "scan_iter") and hasattr(self.store, "delete_many"):
+                # Only the keys under the prefix are scanned, and deleted a batch per round-trip.
+                keys = self.store.scan_iter(prefix)
+                while batch := list(islice(keys, 1000)):
+                    self.store.delete_many(batch)
+            else:
+                for key in [key for key in self.store if key.startswith(prefix)]:
+                    del self.store[key]
+        except Exception as e:
+            logger.warning(f"Identity cache store unavailable: {e}")
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, data = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return data
+                del self._entries[key]
+        if self.store is None:
+            return None
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"Identity cache store unavailable: {e}")
+            return None
+        if value is None:
+            return None
+        data = dumps(value)
+        self._set_local(key, data)
+        return data
+
+    def _set(self, key: str, data: bytes) -> None:
+        self._set_local(key, data)
+        if self.store is not None:
+            try:
+                self.store[key] = loads(data)
+            except Exception as e:
+                logger.warning(f"Identity cache store unavailable: {e}")
+
+    def _set_local(self, key: str, data: bytes) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.store is not None:
+            try:
+                del self.store[key]
+            except Exception as e:
+                logger.warning(f"Identity cache store unavailable: {e}")
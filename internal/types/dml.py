@@ -0,0 +1,46 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+
+def upsert(
+    table: Table,
+    dialect_name: str,
+    index_elements: Optional[Iterable[str]] = None,
+    update_columns: Optional[Iterable[str]] = None,
+) -> Insert:
+    """
+    Builds a native "insert or update" statement, to be executed with one or many rows.
+
+    Args:
+        table: The target table.
+        dialect_name: The SQLAlchemy dialect name, e.g. ``engine.dialect.name``.
+        index_elements: Columns of the conflicting unique key. Defaults to the primary key.
+            MySQL always uses whichever unique key conflicts.
+        update_columns: Columns overwritten on conflict. Defaults to every other column.
+
+    Returns:
+        ``INSERT ... ON CONFLICT DO UPDATE`` (Postgres, SQLite) or
+        ``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL).
+    """
+    keys = list(index_elements) if index_elements else [column.name for column in table.primary_key.columns]
+    if update_columns is None:
+        update_columns = [column.name for column in table.columns if column.name not in keys]
+    update_columns = list(update_columns)
+
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect = postgresql if dialect_name == "postgresql" else sqlite
+        statement = dialect.insert(table)
+        if not update_columns:
+            return statement.on_conflict_do_nothing(index_elements=keys)
+        return statement.on_conflict_do_update(
+            index_elements=keys, set_={name: statement.excluded[name] for name in update_columns}
+        )
+    if dialect_name in ("mysql", "mariadb"):
+        statement = mysql.insert(table)
+        # A no-op assignment keeps the existing row when there's nothing to update.
+        update_columns = update_columns or keys[:1]
+        return statement.on_duplicate_key_update({name: statement.inserted[name] for name in update_columns})
+    raise NotImplementedError(f"Upsert is not supported for {dialect_name}")
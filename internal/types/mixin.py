@@ -1,15 +1,36 @@
 import logging
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from sqlalchemy import bindparam, delete, func, insert, literal, text, tuple_
 from sqlalchemy.exc import IntegrityError, NoResultFound, OperationalError
 from sqlalchemy.orm.exc import FlushError
 from sqlmodel import SQLModel, select
 
+from internal.types.dml import upsert
+from internal.types.statements import statement_cache
+
 logger = logging.getLogger(__name__)
 
+# Row estimates kept by the planner: free to read, but only as fresh as the last ANALYZE.
+_APPROXIMATE_COUNT_QUERIES = {
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)",
+    "mysql": "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) AND TABLE_NAME = :table",
+}
+
+_OPERATIONS = {
+    "first": lambda cls: select(cls).limit(1),
+    "one": lambda cls: select(cls),
+    "all": lambda cls: select(cls),
+    "count": lambda cls: select(func.count()).select_from(cls),
+    "exists": lambda cls: select(literal(1)).select_from(cls).limit(1),
+}
+
 
 class ActiveRecordMixin:
     __config__ = None
+    # An internal.types.cache.IdentityCache to front one_by_id and first_by_field with, opt-in per model.
+    __identity_cache__ = None
 
     @property
     def primary_key(self):
@@ -22,12 +43,27 @@ class ActiveRecordMixin:
 
     @classmethod
     def one_by_id(cls, session, id: int):
-        obj = session.get(cls, id)
+        cache = cls.__identity_cache__
+        if cache is None:
+            return session.get(cls, id)
+        obj = cache.load(session, cls, id)
+        if obj is None:
+            obj = session.get(cls, id)
+            if obj is not None:
+                cache.put(obj)
         return obj
 
     @classmethod
     def first_by_field(cls, session, field: str, value: Any):
-        return cls.first_by_fields(session, {field: value})
+        cache = cls.__identity_cache__
+        if cache is None:
+            return cls.first_by_fields(session, {field: value})
+        obj = cache.load_by_field(session, cls, field, value)
+        if obj is None:
+            obj = cls.first_by_fields(session, {field: value})
+            if obj is not None:
+                cache.put(obj, field)
+        return obj
 
     @classmethod
     def one_by_field(cls, session, field: str, value: Any):
@@ -35,37 +71,51 @@ class ActiveRecordMixin:
 
     @classmethod
     def first_by_fields(cls, session, fields: dict):
-        statement = select(cls)
-        for key, value in fields.items():
-            statement = statement.where(getattr(cls, key) == value)
+        statement, params = cls.cached_statement("first", fields)
         try:
-            return session.exec(statement).first()
+            return session.exec(statement, params=params).first()
         except NoResultFound:
             logger.error(f"{cls}: first_by_fields failed, NoResultFound")
             return None
 
     @classmethod
     def one_by_fields(cls, session, fields: dict):
-        statement = select(cls)
-        for key, value in fields.items():
-            statement = statement.where(getattr(cls, key) == value)
+        statement, params = cls.cached_statement("one", fields)
         try:
-            return session.exec(statement).one()
+            return session.exec(statement, params=params).one()
         except NoResultFound:
             logger.error(f"{cls}: one_by_fields failed, NoResultFound")
             return None
 
     @classmethod
     def all_by_field(cls, session, field: str, value: Any):
-        statement = select(cls).where(getattr(cls, field) == value)
-        return session.exec(statement).all()
+        return cls.all_by_fields(session, {field: value})
 
     @classmethod
     def all_by_fields(cls, session, fields: dict):
-        statement = select(cls)
-        for key, value in fields.items():
-            statement = statement.where(getattr(cls, key) == value)
-        return session.exec(statement).all()
+        statement, params = cls.cached_statement("all", fields)
+        return session.exec(statement, params=params).all()
+
+    @classmethod
+    def cached_statement(cls, operation: str, fields: dict):
+        """
+        Returns the cached statement of a finder and its parameters.
+
+        Statements are cached per (model, field names, operation) with the values
+        as bound parameters. ``None`` values compile to ``IS NULL``, so they are
+        part of the key too.
+        """
+        nulls = frozenset(key for key, value in fields.items() if value is None)
+
+        def build():
+            statement = _OPERATIONS[operation](cls)
+            for key in sorted(fields):
+                column = getattr(cls, key)
+                statement = statement.where(column.is_(None) if key in nulls else column == bindparam(key))
+            return statement
+
+        statement = statement_cache.get((cls, frozenset(fields), operation, nulls), build)
+        return statement, {key: value for key, value in fields.items() if value is not None}
 
     @classmethod
     def convert_without_saving(
@@ -118,8 +168,48 @@ class ActiveRecordMixin:
             return cls.create(session, obj)  # Create
 
     @classmethod
-    def count(cls, session) -> int:
-        return len(cls.all(session))
+    def count(cls, session, approximate: bool = False) -> int:
+        """
+        Counts the rows of the table with ``SELECT count(*)``.
+
+        Args:
+            approximate: Read the planner's row estimate instead, which is instant on
+                huge tables but can be off. Falls back to an exact count on dialects
+                without statistics, or when the table was never analyzed.
+        """
+        if approximate:
+            estimate = cls.approximate_count(session)
+            if estimate is not None:
+                return estimate
+        return cls.count_by_fields(session, {})
+
+    @classmethod
+    def count_by_fields(cls, session, fields: dict) -> int:
+        statement, params = cls.cached_statement("count", fields)
+        return session.exec(statement, params=params).one()
+
+    @classmethod
+    def exists_by_fields(cls, session, fields: dict) -> bool:
+        statement, params = cls.cached_statement("exists", fields)
+        return session.exec(statement, params=params).first() is not None
+
+    @classmethod
+    def approximate_count(cls, session) -> Optional[int]:
+        """
+        Returns the row estimate from ``pg_class.reltuples`` (Postgres) or
+        ``information_schema.TABLES.TABLE_ROWS`` (MySQL), or None if there is none.
+        """
+        table = cls.__table__  # type: ignore
+        query = _APPROXIMATE_COUNT_QUERIES.get(session.get_bind().dialect.name)
+        if query is None:
+            return None
+        name = f"{table.schema}.{table.name}" if table.schema else table.name
+        params = {"name": name, "schema": table.schema, "table": table.name}
+        estimate = session.exec(text(query), params=params).scalar()
+        # Postgres reports -1 for a table that was never vacuumed or analyzed.
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
 
     def refresh(self, session):
         session.refresh(self)
@@ -128,6 +218,8 @@ class ActiveRecordMixin:
         session.add(self)
         try:
             session.commit()
+            if self.__identity_cache__ is not None:
+                self.__identity_cache__.invalidate(self)
             session.refresh(self)
             return True
         except (IntegrityError, OperationalError, FlushError) as e:
@@ -146,12 +238,183 @@ class ActiveRecordMixin:
     def delete(self, session):
         session.delete(self)
         session.commit()
+        if self.__identity_cache__ is not None:
+            self.__identity_cache__.invalidate(self)
 
     @classmethod
     def all(cls, session):
         return session.exec(select(cls)).all()
 
     @classmethod
-    def delete_all(cls, session):
-        for obj in cls.all(session):
-            obj.delete(session)
+    def iter_all(cls, session, yield_per: int = 1000) -> Iterator[SQLModel]:
+        return cls.iter_by_fields(session, {}, yield_per)
+
+    @classmethod
+    def iter_by_fields(cls, session, fields: dict, yield_per: int = 1000) -> Iterator[SQLModel]:
+        """
+        Streams matching rows with a server-side cursor, ``yield_per`` objects at a time.
+
+        The session's connection stays busy until the iterator is exhausted or closed.
+        """
+        statement = select(cls).execution_options(yield_per=yield_per)
+        for key, value in fields.items():
+            statement = statement.where(getattr(cls, key) == value)
+        with session.exec(statement) as result:
+            yield from result
+
+    @classmethod
+    def paginate(cls, session, after: Any = None, limit: int = 100, fields: Optional[dict] = None) -> List[SQLModel]:
+        """
+        Returns a page of rows ordered by primary key (keyset pagination).
+
+        Args:
+            after: The primary key of the last row of the previous page, e.g.
+                ``page[-1].primary_key``, or None for the first page.
+            limit: The page size.
+            fields: Optional equality filters.
+
+        Returns:
+            Up to ``limit`` rows; fewer means this was the last page.
+        """
+        keys = list(cls.__mapper__.primary_key)  # type: ignore
+        statement = select(cls).order_by(*keys).limit(limit)
+        for key, value in (fields or {}).items():
+            statement = statement.where(getattr(cls, key) == value)
+        if after is not None:
+            after = tuple(after) if isinstance(after, (tuple, list)) else (after,)
+            if len(after) != len(keys):
+                raise ValueError(f"{cls.__name__}: expected {len(keys)} primary key values, got {len(after)}")
+            statement = statement.where(keys[0] > after[0] if len(keys) == 1 else tuple_(*keys) > tuple_(*after))
+        return session.exec(statement).all()
+
+    @classmethod
+    def delete_all(cls, session) -> int:
+        return cls.delete_where(session, {})
+
+    @classmethod
+    def delete_where(cls, session, fields: dict) -> int:
+        statement = delete(cls)
+        for key, value in fields.items():
+            statement = statement.where(getattr(cls, key) == value)
+        try:
+            result = session.exec(statement)
+            session.commit()
+            if cls.__identity_cache__ is not None:
+                cls.__identity_cache__.clear(cls)
+            return result.rowcount
+        except (IntegrityError, OperationalError) as e:
+            logger.error(e)
+            session.rollback()
+            return 0
+
+    @classmethod
+    def to_rows(cls, sources: Iterable[Union[Dict[str, Any], SQLModel]]) -> List[Dict[str, Any]]:
+        """
+        Validates sources into plain column dicts holding only the fields each source sets.
+
+        Unset fields are left out, so inserts fall back to the column defaults and
+        upserts never overwrite them. A primary key set to None is left to the database.
+        """
+        keys = [column.name for column in cls.__table__.primary_key.columns]  # type: ignore
+        rows = []
+        for source in sources:
+            fields = source.model_fields_set if isinstance(source, SQLModel) else set(source)
+            row = cls.convert_without_saving(source).model_dump(include=fields)
+            for key in keys:
+                if key in row and row[key] is None:
+                    del row[key]
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _group_rows(rows: List[Dict[str, Any]]) -> List[Tuple[Tuple[str, ...], List[int]]]:
+        """
+        Splits rows into runs with the same keys, as an executemany needs them,
+        keeping the rows in order.
+
+        Returns:
+            The keys and row indexes of every run.
+        """
+        groups: List[Tuple[Tuple[str, ...], List[int]]] = []
+        for index, row in enumerate(rows):
+            fields = tuple(sorted(row))
+            if groups and groups[-1][0] == fields:
+                groups[-1][1].append(index)
+            else:
+                groups.append((fields, [index]))
+        return groups
+
+    @classmethod
+    def bulk_create(cls, session, sources: Sequence[Union[Dict[str, Any], SQLModel]]) -> Optional[List[Any]]:
+        """
+        Inserts many rows with one executemany per set of supplied fields, bypassing the unit of work.
+
+        Returns:
+            The new primary keys in the order of the sources when the dialect
+            supports executemany with RETURNING, an empty list otherwise, or
+            None if the insert failed.
+        """
+        rows = cls.to_rows(sources)
+        if not rows:
+            return []
+        table = cls.__table__  # type: ignore
+        statement = insert(table)
+        returning = session.get_bind().dialect.insert_executemany_returning
+        if returning:
+            # insertmanyvalues batches only return rows in parameter order when asked to.
+            statement = statement.returning(*table.primary_key.columns, sort_by_parameter_order=True)
+        keys: List[Any] = [None] * len(rows)
+        try:
+            for _, indexes in cls._group_rows(rows):
+                result = session.exec(statement, params=[rows[index] for index in indexes])
+                if returning:
+                    for index, row in zip(indexes, result):
+                        keys[index] = row[0] if len(row) == 1 else tuple(row)
+            session.commit()
+            return keys if returning else []
+        except (IntegrityError, OperationalError) as e:
+            logger.error(e)
+            session.rollback()
+            return None
+
+    @classmethod
+    def bulk_upsert(
+        cls,
+        session,
+        sources: Sequence[Union[Dict[str, Any], SQLModel]],
+        index_elements: Optional[List[str]] = None,
+        update_fields: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Inserts or updates many rows with the dialect's native upsert
+        (``ON CONFLICT DO UPDATE`` or ``ON DUPLICATE KEY UPDATE``).
+
+        Only the fields a source sets are written: a conflicting row keeps the
+        values of the fields it wasn't given.
+
+        Args:
+            index_elements: Fields of the conflicting unique key. Defaults to the primary key.
+            update_fields: Fields overwritten on conflict. Defaults to every other supplied field.
+
+        Returns:
+            The number of rows sent, or 0 if the statement failed.
+        """
+        rows = cls.to_rows(sources)
+        if not rows:
+            return 0
+        table = cls.__table__  # type: ignore
+        dialect_name = session.get_bind().dialect.name
+        index_elements = index_elements or [column.name for column in table.primary_key.columns]
+        try:
+            for fields, indexes in cls._group_rows(rows):
+                updated = [name for name in (update_fields or fields) if name in fields and name not in index_elements]
+                statement = upsert(table, dialect_name, index_elements, updated)
+                session.exec(statement, params=[rows[index] for index in indexes])
+            session.commit()
+            if cls.__identity_cache__ is not None:
+                cls.__identity_cache__.clear(cls)
+            return len(rows)
+        except (IntegrityError, OperationalError) as e:
+            logger.error(e)
+            session.rollback()
+            return 0
@@ -7,7 +7,7 @@ from internal.types.mixin import ActiveRecordMixin
 
 
 class SQLModelBase(SQLModel):
-    id: Optional[int] = Field(default_factory=int, primary_key=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
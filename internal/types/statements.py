@@ -0,0 +1,42 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+
+
+class StatementCache:
+    def __init__(self) -> None:
+        """
+        Keeps one parameterized statement per key, e.g. (model, field names, operation).
+
+        Values are passed as bound parameters at execution time, so the same
+        statement object is reused and SQLAlchemy's compiled cache is hit on
+        every call instead of building a new ``select()`` each time.
+        """
+        self.hits = 0
+        self.misses = 0
+        self._statements: Dict[Hashable, Any] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            return statement
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                self.misses += 1
+                statement = self._statements[key] = build()
+            else:
+                self.hits += 1
+        return statement
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._statements)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self.hits = self.misses = 0
+
+
+statement_cache = StatementCache()
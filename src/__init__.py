@@ -1,2 +1,3 @@
 from . import models
-from .blocks import SQLBlock
+from .blocks import SQLBlock, acreate_blocks, create_blocks
+from .migration import CheckpointStore, CopyStats, MigrationScheduler, PrimaryKeyChunker, TableCopier
@@ -1 +1,2 @@
 from .sqlblock import SQLBlock
+from .factory import acreate_blocks, create_blocks
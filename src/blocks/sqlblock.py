@@ -1,6 +1,7 @@
 import os
 import time
-from typing import Any, Generic, Literal, Optional
+from types import ModuleType
+from typing import Any, Dict, Generic, Literal, Optional
 
 from contrib import BaseLogging, SQLModelGenerator
 from core import SRC_DIR
@@ -46,6 +47,8 @@ class SQLBlock(Block, Generic[DBConfigType, DBInterfaceType]):
                 self.db = db
         if not self.db:
             raise ValueError("Can't establish database connection")
+        self.models: Optional[ModuleType] = None
+        self.timings: Dict[str, float] = {}
         if self.allow_process:
             self.preprocess()
 
@@ -53,8 +56,8 @@ class SQLBlock(Block, Generic[DBConfigType, DBInterfaceType]):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.db.session.close()  # type: ignore
-        self.db.engine.dispose()  # type: ignore
+        # Shared engines stay open for the other blocks of the process.
+        self.db.close()  # type: ignore
 
     def _check_python_file(self, filename: str):
         if filename.endswith(".py"):
@@ -71,19 +74,37 @@ class SQLBlock(Block, Generic[DBConfigType, DBInterfaceType]):
         if not module:
             raise ValueError("Incorrect config format")
         file_path = os.path.join(SRC_DIR, self._check_python_file(module))
+        start = time.perf_counter()
         try:
-            s = SQLModelGenerator(file_path, self.db.engine, self.db.metadata)  # type: ignore
-            self.generator = s
-            s.generate()
+            s = SQLModelGenerator(
+                file_path,
+                self.db.engine,  # type: ignore
+                self.db.metadata,  # type: ignore
+                include=self.data.get("include"),
+                exclude=self.data.get("exclude"),
+                lazy=self.data.get("lazy", False),
+            )
         except Exception as e:
+            # Without a reflected schema the block is unusable.
             logger.error(e)
-
-        while not os.path.exists(file_path):
-            time.sleep(1)
-        if os.path.isfile(file_path):
+            raise
+        self.generator = s
+        self.timings["reflect"] = time.perf_counter() - start
+        if s.lazy:
+            # Tables are reflected on demand through self.generator.get_table
             return True
-        else:
-            raise ValueError("%s isn't a file!" % file_path)
+        try:
+            # The models are handed over in memory, the file is only written for reference.
+            self.models = s.build_module(f"src.{os.path.splitext(module)[0]}")
+            if self.data.get("emit_file", True):
+                s.generate()
+        except Exception as e:
+            # The database and reflected metadata stay usable, only the generated models are missing.
+            logger.error(f"Model generation failed for {module}: {e}")
+            return False
+        finally:
+            self.timings["codegen"] = time.perf_counter() - start - self.timings["reflect"]
+        return True
 
     def process(self, *args, **kwargs) -> Any | None:
         "Use with syntax instead due to the database connection."
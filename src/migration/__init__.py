@@ -0,0 +1,8 @@
+from .copy import Chunk, CopyStats, TableCopier, column_pairs, get_database, primary_key_column, resolve_table
+from .scheduler import MigrationScheduler, dependency_graph
+from .chunker import PrimaryKeyChunker
+from .checkpoint import CheckpointStore
+from .loaders import BulkLoader, MySQLLoader, PostgresCopyLoader, SQLiteLoader, get_loader
+from .aio import AsyncTableCopier, aresolve_table
+from .planner import SchemaChange, SchemaPlan, SchemaPlanner, plan_migration
+from .sync import IncrementalSync
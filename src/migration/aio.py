@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from internal import AsyncDatabaseInterface
+
+from .copy import CopyStats, column_pairs, get_database, logger
+from .loaders import get_loader
+
+
+async def aresolve_table(db: AsyncDatabaseInterface, table: Any) -> Table:
+    """Async variant of ``resolve_table``, reflecting unknown names through the async engine."""
+    if isinstance(table, Table):
+        return table
+    if hasattr(table, "__table__"):
+        return table.__table__
+    if table in db.metadata.tables:
+        return db.metadata.tables[table]
+    async with db.engine.connect() as connection:
+        return await connection.run_sync(lambda sync: Table(table, db.metadata, autoload_with=sync))
+
+
+class AsyncTableCopier:
+    def __init__(
+        self,
+        source: Any,
+        target: Any,
+        *,
+        batch_size: int = 10_000,
+        commit_every: int = 10,
+        column_map: Optional[Dict[str, str]] = None,
+        progress: Optional[Callable[[CopyStats], None]] = None,
+        max_concurrency: int = 8,
+    ) -> None:
+        """
+        Streams rows between two AsyncDatabaseInterfaces, so one event loop can
+        drive many table copies at once without a thread per connection.
+
+        Args:
+            source: The source AsyncDatabaseInterface.
+            target: The target AsyncDatabaseInterface.
+            batch_size: Number of rows fetched and inserted per round-trip.
+            commit_every: Number of batches written between two target commits.
+            column_map: Optional mapping of target column name to source column name.
+            progress: Optional callback invoked with the running stats after each commit.
+            max_concurrency: Number of tables copied at the same time by ``copy_tables``,
+                1 for targets allowing a single writer (SQLite).
+        """
+        if batch_size < 1 or commit_every < 1 or max_concurrency < 1:
+            raise ValueError("batch_size, commit_every and max_concurrency must be positive")
+        self.source = get_database(source)
+        self.target = get_database(target)
+        loader = get_loader(self.target)
+        if max_concurrency > 1 and not loader.concurrent_writes:
+            logger.warning(f"{loader.name} loader writes one table at a time, ignoring max_concurrency={max_concurrency}")
+            max_concurrency = 1
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.column_map = column_map or {}
+        self.progress = progress
+        self.max_concurrency = max_concurrency
+
+    async def copy_table(self, table: Any, target_table: Any = None, *, where: Any = None) -> CopyStats:
+        """
+        Copies every row of a table from the source to the target database.
+
+        Args:
+            table: The source Table, SQLModel class or table name.
+            target_table: The target Table, SQLModel class or table name. Defaults to the source table name.
+            where: Optional SQLAlchemy clause restricting the copied rows.
+
+        Returns:
+            The copy statistics.
+        """
+        source_table = await aresolve_table(self.source, table)
+        target_table = await aresolve_table(self.target, source_table.name if target_table is None else target_table)
+        pairs = column_pairs(source_table, target_table, self.column_map)
+        keys = [key for _, key in pairs]
+
+        statement = select(*[column for column, _ in pairs])
+        if where is not None:
+            statement = statement.where(where)
+        statement = statement.execution_options(yield_per=self.batch_size)
+
+        stats = CopyStats(table=target_table.name)
+        start = time.perf_counter()
+        async with self.source.engine.connect() as source_conn, self.target.engine.connect() as target_conn:
+            pending = 0
+            result = await source_conn.stream(statement)
+            async for partition in result.partitions():
+                await target_conn.execute(insert(target_table), [dict(zip(keys, row)) for row in partition])
+                stats.rows += len(partition)
+                stats.batches += 1
+                pending += 1
+                if pending >= self.commit_every:
+                    await self._commit(target_conn, stats, start)
+                    pending = 0
+            if pending:
+                await self._commit(target_conn, stats, start)
+
+        stats.elapsed = time.perf_counter() - start
+        logger.info(f"Copied {stats}")
+        return stats
+
+    async def copy_tables(self, tables: Iterable[Any]) -> Dict[str, CopyStats]:
+        """
+        Copies many tables concurrently, at most ``max_concurrency`` at a time.
+
+        Foreign keys are not ordered, copy parents first or disable constraint checks on the target.
+
+        Args:
+            tables: Source tables, or (source table, target table) pairs.
+
+        Returns:
+            The copy statistics by target table name.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def copy(pair: Tuple[Any, Any]) -> CopyStats:
+            async with semaphore:
+                return await self.copy_table(*pair)
+
+        pairs = [table if isinstance(table, tuple) else (table, None) for table in tables]
+        results = await asyncio.gather(*(copy(pair) for pair in pairs))
+        return {stats.table: stats for stats in results}
+
+    async def _commit(self, connection: AsyncConnection, stats: CopyStats, start: float) -> None:
+        await connection.commit()
+        stats.commits += 1
+        stats.elapsed = time.perf_counter() - start
+        logger.debug(f"Committed {stats}")
+        if self.progress:
+            self.progress(stats)
@@ -0,0 +1,193 @@
+from datetime import date, datetime, time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from orjson import dumps, loads
+from sqlalchemy import Column, Connection, Engine, insert, select, update
+from sqlmodel import SQLModel
+
+from core.db import marco_engine
+from core.models import BlockProcesses, MappingReport
+
+from .copy import Chunk, CopyStats, logger
+
+PROCESS_PREFIX = "copy:"
+SYNC_PREFIX = "sync:"
+
+
+def _default(value: Any) -> Any:
+    # Keys orjson can't serialize natively (Decimal, bytes, ...) are stored as text and parsed back by parse_value.
+    return value.hex() if isinstance(value, (bytes, bytearray, memoryview)) else str(value)
+
+
+def parse_value(column: Column, value: Any) -> Any:
+    """
+    Restores a key or watermark read back from JSON to the Python type of its column.
+
+    Dates, Decimals and bytes come back from JSON as strings, which would be
+    compared to the column as text (or rejected, e.g. by SQLite's DateTime).
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    if python_type is bytes:
+        return bytes.fromhex(value)
+    return python_type(value) if python_type is not str else value
+
+
+class CheckpointStore:
+    def __init__(self, job: str, engine: Optional[Engine] = None) -> None:
+        """
+        Persists the copy progress of a migration job in the marco database.
+
+        Every chunk of every table owns one ``block_processes`` row, keyed by the
+        job name and ``copy:<table>:<chunk>``, whose ``additional_data`` holds the
+        chunk bounds and last committed key. Rows are updated once per target
+        commit, never per copied row. Finished tables are summarized in
+        ``mapping_report``.
+
+        A checkpoint is written in its own transaction right after the target
+        commit, so a crash between the two copies the last batch again on
+        resume: resuming relies on an idempotent load (e.g. upserts, or a
+        target primary key rejecting the duplicates to be cleaned up).
+
+        Args:
+            job: A stable name identifying the migration run across restarts.
+            engine: The engine holding the checkpoint tables. Defaults to the marco engine.
+        """
+        self.job = job
+        self.engine = engine or marco_engine
+        self._ids: Dict[str, int] = {}
+        self._lock = Lock()
+        SQLModel.metadata.create_all(
+            self.engine, tables=[BlockProcesses.__table__, MappingReport.__table__]  # type: ignore
+        )
+
+    @staticmethod
+    def process_name(table: str, index: int) -> str:
+        return f"{PROCESS_PREFIX}{table}:{index}"
+
+    def load(self, table: str, key: Optional[Column] = None) -> List[Chunk]:
+        """
+        Loads the chunks checkpointed for a table.
+
+        Args:
+            table: The source table name.
+            key: The primary key column, restoring the type of the chunk bounds and last key.
+
+        Returns:
+            The chunks ordered by index, or an empty list if the table was never started.
+        """
+        processes = BlockProcesses.__table__
+        prefix = f"{PROCESS_PREFIX}{table}:"
+        statement = select(processes.c.id, processes.c.process_name, processes.c.additional_data).where(
+            processes.c.block_id == self.job,
+            processes.c.process_name.like(f"{prefix}%"),
+        )
+        chunks = []
+        with self.engine.connect() as connection:
+            for id, name, data in connection.execute(statement):
+                if not name.startswith(prefix):  # "_" in a table name is a LIKE wildcard
+                    continue
+                chunk = Chunk(**loads(data))
+                if key is not None:
+                    chunk.lower, chunk.upper, chunk.last_key = (
+                        parse_value(key, value) for value in (chunk.lower, chunk.upper, chunk.last_key)
+                    )
+                self._ids[self.process_name(chunk.table, chunk.index)] = id
+                chunks.append(chunk)
+        chunks.sort(key=lambda chunk: chunk.index)
+        if chunks:
+            logger.info(f"Resuming {table}: {sum(c.done for c in chunks)}/{len(chunks)} chunks done")
+        return chunks
+
+    def save(self, *chunks: Chunk) -> None:
+        """Writes the state of the given chunks in a single transaction."""
+        now = datetime.utcnow()
+        with self._lock, self.engine.begin() as connection:
+            for chunk in chunks:
+                self._write(connection, self.process_name(chunk.table, chunk.index), chunk.__dict__, now)
+
+    def load_watermark(self, table: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads the high-water mark of an incremental sync.
+
+        Returns:
+            ``{"column": ..., "value": ..., "key": ...}``, or None if the table was never synced.
+        """
+        processes = BlockProcesses.__table__
+        statement = select(processes.c.id, processes.c.additional_data).where(
+            processes.c.block_id == self.job, processes.c.process_name == f"{SYNC_PREFIX}{table}"
+        )
+        with self.engine.connect() as connection:
+            row = connection.execute(statement).first()
+        if row is None:
+            return None
+        self._ids[f"{SYNC_PREFIX}{table}"] = row.id
+        return loads(row.additional_data)
+
+    def save_watermark(self, table: str, column: str, value: Any, key: Any) -> None:
+        """Stores the watermark value and primary key of the last row synced into the target."""
+        with self._lock, self.engine.begin() as connection:
+            data = {"column": column, "value": value, "key": key}
+            self._write(connection, f"{SYNC_PREFIX}{table}", data, datetime.utcnow())
+
+    def _write(self, connection: Connection, name: str, data: Dict[str, Any], now: datetime) -> None:
+        processes = BlockProcesses.__table__
+        values = {
+            "process_time": now.isoformat(),
+            "additional_data": dumps(data, default=_default).decode(),
+            "updated_at": now,
+        }
+        id = self._ids.get(name)
+        if id is None:
+            result = connection.execute(
+                insert(processes).values(block_id=self.job, process_name=name, created_at=now, **values)
+            )
+            self._ids[name] = result.inserted_primary_key[0]  # type: ignore
+        else:
+            connection.execute(update(processes).where(processes.c.id == id).values(**values))
+
+    def complete(self, table: str, target_table: str, stats: CopyStats, **additional_data: Any) -> None:
+        """Records a finished table in the mapping report."""
+        now = datetime.utcnow()
+        data = {"rows": stats.rows, "elapsed": stats.elapsed, **additional_data}
+        with self.engine.begin() as connection:
+            connection.execute(
+                insert(MappingReport.__table__).values(
+                    s_id=self.job,
+                    s_slug=table,
+                    t_id=self.job,
+                    t_slug=target_table,
+                    additional_data=dumps(data, default=_default).decode(),
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+
+    def reset(self, table: Optional[str] = None) -> None:
+        """Forgets the checkpoints of a table, or of the whole job."""
+        processes = BlockProcesses.__table__
+        prefix = f"{PROCESS_PREFIX}{table}:" if table else PROCESS_PREFIX
+        # Table names may contain "_" or "%", which LIKE would treat as wildcards.
+        condition = processes.c.process_name.startswith(prefix, autoescape=True)
+        with self._lock, self.engine.begin() as connection:
+            connection.execute(processes.delete().where(processes.c.block_id == self.job, condition))
+        self._ids = {name: id for name, id in self._ids.items() if not name.startswith(prefix)}
+
+    def reset_watermark(self, table: Optional[str] = None) -> None:
+        """Forgets the sync watermark of a table, or of every table, so the next sync starts over."""
+        processes = BlockProcesses.__table__
+        if table:
+            condition = processes.c.process_name == f"{SYNC_PREFIX}{table}"
+        else:
+            condition = processes.c.process_name.startswith(SYNC_PREFIX, autoescape=True)
+        with self._lock, self.engine.begin() as connection:
+            connection.execute(processes.delete().where(processes.c.block_id == self.job, condition))
+        names = {f"{SYNC_PREFIX}{table}"} if table else {name for name in self._ids if name.startswith(SYNC_PREFIX)}
+        self._ids = {name: id for name, id in self._ids.items() if name not in names}
@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Literal, Optional
+
+from sqlalchemy import Table, func, select
+
+from .copy import Chunk, CopyStats, TableCopier, logger, primary_key_column, resolve_table
+
+
+class PrimaryKeyChunker:
+    def __init__(
+        self,
+        copier: TableCopier,
+        *,
+        chunks: int = 8,
+        max_workers: int = 4,
+        method: Literal["auto", "minmax", "quantile"] = "auto",
+        retries: int = 3,
+    ) -> None:
+        """
+        Splits a table on its primary key and copies the ranges in parallel.
+
+        Args:
+            copier: The copier used for every chunk.
+            chunks: Number of key ranges to split a table into.
+            max_workers: Number of chunks copied at the same time, 1 for targets allowing a single writer (SQLite).
+            method: ``minmax`` splits integer keys evenly between MIN and MAX,
+                ``quantile`` uses NTILE boundaries and works for any orderable key,
+                ``auto`` picks ``minmax`` for integer keys and ``quantile`` otherwise.
+            retries: Attempts per chunk and run before giving up on it.
+        """
+        if chunks < 1 or max_workers < 1 or retries < 1:
+            raise ValueError("chunks, max_workers and retries must be positive")
+        if max_workers > 1 and not copier.loader.concurrent_writes:
+            logger.warning(f"{copier.loader.name} loader writes one chunk at a time, ignoring max_workers={max_workers}")
+            max_workers = 1
+        self.copier = copier
+        self.chunks = chunks
+        self.max_workers = max_workers
+        self.method = method
+        self.retries = retries
+
+    def plan(self, table: Any) -> List[Chunk]:
+        """
+        Computes the key ranges of a source table.
+
+        Returns:
+            The chunks covering the whole key space, the first and last ones unbounded.
+        """
+        source = self.copier.source
+        table = resolve_table(source, table)
+        key = primary_key_column(table)
+
+        with source.engine.connect() as connection:
+            low, high = connection.execute(select(func.min(key), func.max(key))).one()
+            if low is None:
+                return [Chunk(table.name, 0)]
+            method = self.method
+            if method == "auto":
+                method = "minmax" if isinstance(low, int) and isinstance(high, int) else "quantile"
+            if method == "minmax":
+                if not isinstance(low, int):
+                    raise ValueError(f"minmax chunking needs an integer key, {table.name}.{key.name} is not")
+                step = max((high - low + 1) // self.chunks, 1)
+                bounds = list(range(low + step, high + 1, step))[: self.chunks - 1]
+            else:
+                bounds = self._quantiles(connection, table)
+
+        edges = [None, *bounds, None]
+        return [Chunk(table.name, i, edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+    def _quantiles(self, connection, table: Table) -> List[Any]:
+        key = primary_key_column(table)
+        bucket = func.ntile(self.chunks).over(order_by=key).label("bucket")
+        ranked = select(key.label("key"), bucket).subquery()
+        statement = select(func.min(ranked.c.key)).group_by(ranked.c.bucket).order_by(ranked.c.bucket)
+        # The first bucket starts the table, which the unbounded first chunk already covers.
+        return [row[0] for row in connection.execute(statement)][1:]
+
+    def run(self, table: Any, target_table: Any = None, chunks: Optional[List[Chunk]] = None) -> CopyStats:
+        """
+        Copies a table chunk by chunk.
+
+        A failing chunk is retried from its last committed key, so finished and
+        partially copied ranges are never copied twice. Passing the chunks of a
+        failed run, or using a copier with a checkpoint store, resumes only
+        the unfinished ones.
+
+        Args:
+            table: The source Table, SQLModel class or table name.
+            target_table: The target Table, SQLModel class or table name. Defaults to the source table name.
+            chunks: Chunks to copy, planned from the table when omitted.
+
+        Returns:
+            The aggregated copy statistics.
+
+        Raises:
+            RuntimeError: If a chunk still fails after all retries.
+        """
+        copier = self.copier
+        table = resolve_table(copier.source, table)
+        target_table = resolve_table(copier.target, table.name if target_table is None else target_table)
+        if chunks is None and copier.checkpoints is not None:
+            chunks = copier.checkpoints.load(table.name, primary_key_column(table))
+            if not chunks:
+                chunks = self.plan(table)
+                copier.checkpoints.save(*chunks)
+        chunks = self.plan(table) if chunks is None else chunks
+        pending = [chunk for chunk in chunks if not chunk.done]
+
+        stats = CopyStats(table=target_table.name)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chunk") as executor:
+            for chunk_stats in executor.map(
+                lambda chunk: copier.copy_chunk(table, target_table, chunk, retries=self.retries), pending
+            ):
+                copier._add_stats(stats, chunk_stats)
+        stats.elapsed = time.perf_counter() - start
+        copier.finish(table, target_table, chunks, stats)
+        return stats
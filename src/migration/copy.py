@@ -0,0 +1,377 @@
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Table, select
+from sqlalchemy.engine import Connection
+
+from contrib import BaseLogging
+from contrib.generator.sqlmodel import convert_column_name
+from internal import DatabaseInterface
+
+from .loaders import BulkLoader, get_loader
+
+if TYPE_CHECKING:
+    from .checkpoint import CheckpointStore
+
+logger = BaseLogging("migration")
+
+
+def get_database(obj: Any) -> DatabaseInterface:
+    """Return the database interface behind a SQLBlock, or the object itself."""
+    return getattr(obj, "db", obj)
+
+
+def resolve_table(db: DatabaseInterface, table: Any) -> Table:
+    """Resolve a Table, a SQLModel class or a table name against a database.
+
+    Names which are not yet known to ``db.metadata`` are reflected on demand.
+    """
+    if isinstance(table, Table):
+        return table
+    if hasattr(table, "__table__"):
+        return table.__table__
+    if table in db.metadata.tables:
+        return db.metadata.tables[table]
+    return Table(table, db.metadata, autoload_with=db.engine)
+
+
+def primary_key_column(table: Table) -> Column:
+    """Return the single-column primary key of a table used for keyset pagination."""
+    columns = list(table.primary_key.columns)
+    if len(columns) != 1:
+        raise ValueError(f"{table.name} needs a single-column primary key, got {[c.name for c in columns]}")
+    return columns[0]
+
+
+def column_pairs(
+    source_table: Table, target_table: Table, column_map: Optional[Dict[str, str]] = None
+) -> List[Tuple[Column, str]]:
+    """
+    Matches target columns with source columns.
+
+    A target column is fed by the source column named in ``column_map``, by
+    the source column of the same name, or by the source column whose
+    generated (slugified) name equals it. Unmatched target columns are left
+    to their server defaults.
+
+    Returns:
+        A list of (source column, target column key) pairs.
+    """
+    column_map = column_map or {}
+    by_name = {column.name: column for column in source_table.columns}
+    by_slug = {convert_column_name(column.name): column for column in source_table.columns}
+
+    pairs = []
+    for column in target_table.columns:
+        name = column_map.get(column.name, column.name)
+        source_column = by_name.get(name, by_slug.get(name))
+        if source_column is not None:
+            pairs.append((source_column, column.key))
+    if not pairs:
+        raise ValueError(f"No common columns between {source_table.name} and {target_table.name}")
+    return pairs
+
+
+@dataclass
+class CopyStats:
+    table: str
+    rows: int = 0
+    batches: int = 0
+    commits: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: {self.rows} rows in {self.batches} batches, "
+            f"{self.elapsed:.2f}s ({self.rows_per_sec:.0f} rows/s)"
+        )
+
+
+@dataclass
+class Chunk:
+    """A primary-key range ``[lower, upper)`` of a table, copied and retried independently."""
+
+    table: str
+    index: int
+    lower: Any = None
+    upper: Any = None
+    last_key: Any = None
+    rows: int = 0
+    attempts: int = 0
+    done: bool = False
+    error: Optional[str] = None
+
+
+class TableCopier:
+    def __init__(
+        self,
+        source: Any,
+        target: Any,
+        *,
+        batch_size: int = 10_000,
+        commit_every: int = 10,
+        column_map: Optional[Dict[str, str]] = None,
+        progress: Optional[Callable[[CopyStats], None]] = None,
+        checkpoints: Optional["CheckpointStore"] = None,
+        loader: Optional[BulkLoader] = None,
+    ) -> None:
+        """
+        Streams rows from one database into another without building ORM objects.
+
+        Args:
+            source: The source SQLBlock or DatabaseInterface.
+            target: The target SQLBlock or DatabaseInterface.
+            batch_size: Number of rows fetched and inserted per round-trip.
+            commit_every: Number of batches written between two target commits.
+            column_map: Optional mapping of target column name to source column name.
+            progress: Optional callback invoked with the running stats after each commit.
+            checkpoints: Optional store recording the last committed key of every table,
+                making copies of tables with a single-column primary key resumable.
+            loader: Optional bulk loader writing the batches. Defaults to the fastest one for the target dialect.
+        """
+        if batch_size < 1 or commit_every < 1:
+            raise ValueError("batch_size and commit_every must be positive")
+        self.source = get_database(source)
+        self.target = get_database(target)
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.column_map = column_map or {}
+        self.progress = progress
+        self.checkpoints = checkpoints
+        self.loader = loader or get_loader(self.target)
+
+    def column_pairs(self, source_table: Table, target_table: Table) -> List[Tuple[Column, str]]:
+        return column_pairs(source_table, target_table, self.column_map)
+
+    def copy_table(self, table: Any, target_table: Any = None, *, where: Any = None) -> CopyStats:
+        """
+        Copies every row of a table from the source to the target database.
+
+        With a checkpoint store, tables with a single-column primary key are
+        copied in key order and resume after their last committed key.
+
+        Args:
+            table: The source Table, SQLModel class or table name.
+            target_table: The target Table, SQLModel class or table name. Defaults to the source table name.
+            where: Optional SQLAlchemy clause restricting the copied rows.
+
+        Returns:
+            The copy statistics.
+        """
+        source_table = resolve_table(self.source, table)
+        target_table = resolve_table(self.target, source_table.name if target_table is None else target_table)
+        if self.checkpoints is not None and where is None:
+            if len(source_table.primary_key.columns) == 1:
+                return self.copy_chunks(source_table, target_table)
+            logger.warning(f"{source_table.name} has no single-column primary key, copying without checkpoints")
+        pairs = self.column_pairs(source_table, target_table)
+        keys = [key for _, key in pairs]
+
+        statement = select(*[column for column, _ in pairs])
+        if where is not None:
+            statement = statement.where(where)
+        statement = statement.execution_options(stream_results=True, yield_per=self.batch_size)
+
+        stats = CopyStats(table=target_table.name)
+        start = time.perf_counter()
+        # Loaders tuned for one big transaction only commit at the end.
+        commit_every = self.commit_every if not self.loader.single_transaction else None
+        with (
+            self.source.engine.connect() as source_conn,
+            self.target.engine.connect() as target_conn,
+            self.loader.loading(target_conn),
+        ):
+            pending = 0
+            for partition in source_conn.execute(statement).partitions():
+                self.write_batch(target_conn, target_table, [dict(zip(keys, row)) for row in partition])
+                stats.rows += len(partition)
+                stats.batches += 1
+                pending += 1
+                if commit_every and pending >= commit_every:
+                    self._commit(target_conn, stats, start)
+                    pending = 0
+            if pending:
+                self._commit(target_conn, stats, start)
+
+        stats.elapsed = time.perf_counter() - start
+        logger.info(f"Copied {stats}")
+        return stats
+
+    def copy_keyset(
+        self,
+        table: Any,
+        target_table: Any = None,
+        *,
+        lower: Any = None,
+        upper: Any = None,
+        after: Any = None,
+        on_commit: Optional[Callable[[Any, CopyStats], None]] = None,
+    ) -> CopyStats:
+        """
+        Copies a primary-key range with keyset pagination, ordered by the key.
+
+        Each batch is fetched with ``key > last_key ORDER BY key LIMIT batch_size``
+        so the cost of a page never depends on how far into the table it is.
+
+        Args:
+            table: The source Table, SQLModel class or table name.
+            target_table: The target Table, SQLModel class or table name. Defaults to the source table name.
+            lower: Inclusive lower bound of the key range, unbounded if None.
+            upper: Exclusive upper bound of the key range, unbounded if None.
+            after: Resume after this key (exclusive), takes precedence over ``lower``.
+            on_commit: Optional callback invoked with the last committed key and the stats after each commit.
+
+        Returns:
+            The copy statistics.
+        """
+        source_table = resolve_table(self.source, table)
+        target_table = resolve_table(self.target, source_table.name if target_table is None else target_table)
+        key = primary_key_column(source_table)
+        pairs = self.column_pairs(source_table, target_table)
+        keys = [name for _, name in pairs]
+        columns = [column for column, _ in pairs]
+        key_index = next((i for i, column in enumerate(columns) if column is key), len(columns))
+        if key_index == len(columns):
+            columns.append(key)
+
+        statement = select(*columns).order_by(key).limit(self.batch_size)
+        if upper is not None:
+            statement = statement.where(key < upper)
+
+        stats = CopyStats(table=target_table.name)
+        start = time.perf_counter()
+        last_key = after
+        with (
+            self.source.engine.connect() as source_conn,
+            self.target.engine.connect() as target_conn,
+            self.loader.loading(target_conn),
+        ):
+            pending = 0
+            while True:
+                if last_key is not None:
+                    page = statement.where(key > last_key)
+                elif lower is not None:
+                    page = statement.where(key >= lower)
+                else:
+                    page = statement
+                rows = source_conn.execute(page).all()
+                if not rows:
+                    break
+                self.write_batch(target_conn, target_table, [dict(zip(keys, row)) for row in rows])
+                last_key = rows[-1][key_index]
+                stats.rows += len(rows)
+                stats.batches += 1
+                pending += 1
+                if pending >= self.commit_every:
+                    self._commit(target_conn, stats, start)
+                    pending = 0
+                    if on_commit:
+                        on_commit(last_key, stats)
+                if len(rows) < self.batch_size:
+                    break
+            if pending:
+                self._commit(target_conn, stats, start)
+                if on_commit:
+                    on_commit(last_key, stats)
+
+        stats.elapsed = time.perf_counter() - start
+        logger.info(f"Copied {stats}")
+        return stats
+
+    def copy_chunks(
+        self, table: Table, target_table: Table, chunks: Optional[List[Chunk]] = None, *, retries: int = 1
+    ) -> CopyStats:
+        """
+        Copies the unfinished chunks of a table one after another.
+
+        Without explicit chunks, the checkpointed chunks are resumed, or the
+        whole table is copied as a single chunk.
+
+        Returns:
+            The aggregated copy statistics.
+
+        Raises:
+            RuntimeError: If a chunk still fails after all retries.
+        """
+        if chunks is None:
+            chunks = [Chunk(table.name, 0)]
+            if self.checkpoints:
+                chunks = self.checkpoints.load(table.name, primary_key_column(table)) or chunks
+        stats = CopyStats(table=target_table.name)
+        start = time.perf_counter()
+        for chunk in chunks:
+            if not chunk.done:
+                self._add_stats(stats, self.copy_chunk(table, target_table, chunk, retries=retries))
+        stats.elapsed = time.perf_counter() - start
+        self.finish(table, target_table, chunks, stats)
+        return stats
+
+    def copy_chunk(self, table: Table, target_table: Table, chunk: Chunk, *, retries: int = 1) -> CopyStats:
+        """
+        Copies one chunk, retrying from its last committed key.
+
+        The chunk is checkpointed after every target commit. Only committed rows are counted.
+        """
+        stats = CopyStats(table=target_table.name)
+        for _ in range(retries):
+            if chunk.done:
+                break
+            chunk.attempts += 1
+            committed = CopyStats(table=target_table.name)
+
+            def on_commit(last_key: Any, attempt: CopyStats) -> None:
+                chunk.last_key = last_key
+                chunk.rows += attempt.rows - committed.rows
+                committed.rows, committed.batches, committed.commits = attempt.rows, attempt.batches, attempt.commits
+                if self.checkpoints:
+                    self.checkpoints.save(chunk)
+
+            try:
+                self.copy_keyset(
+                    table,
+                    target_table,
+                    lower=chunk.lower,
+                    upper=chunk.upper,
+                    after=chunk.last_key,
+                    on_commit=on_commit,
+                )
+                chunk.done, chunk.error = True, None
+            except Exception as e:
+                chunk.error = str(e)
+                logger.warning(f"Chunk {chunk.index} of {table.name} failed (attempt {chunk.attempts}): {e}")
+            if self.checkpoints:
+                self.checkpoints.save(chunk)
+            self._add_stats(stats, committed)
+        return stats
+
+    def finish(self, table: Table, target_table: Table, chunks: List[Chunk], stats: CopyStats) -> None:
+        failed = [chunk for chunk in chunks if not chunk.done]
+        if failed:
+            raise RuntimeError(f"{len(failed)} chunk(s) of {table.name} failed: {[c.index for c in failed]}")
+        logger.info(f"Copied {stats} in {len(chunks)} chunk(s)")
+        if self.checkpoints:
+            self.checkpoints.complete(table.name, target_table.name, stats, chunks=len(chunks))
+
+    @staticmethod
+    def _add_stats(stats: CopyStats, other: CopyStats) -> None:
+        stats.rows += other.rows
+        stats.batches += other.batches
+        stats.commits += other.commits
+
+    def write_batch(self, connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]) -> None:
+        """Writes one batch of rows to the target table through the loader."""
+        if rows:
+            self.loader.load(connection, table, rows)
+
+    def _commit(self, connection: Connection, stats: CopyStats, start: float) -> None:
+        connection.commit()
+        stats.commits += 1
+        stats.elapsed = time.perf_counter() - start
+        logger.debug(f"Committed {stats}")
+        if self.progress:
+            self.progress(stats)
@@ -0,0 +1,194 @@
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Sequence
+
+from orjson import dumps
+from sqlalchemy import ARRAY, Table, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import sqltypes
+
+from contrib import BaseLogging
+from internal import DatabaseInterface
+
+logger = BaseLogging("migration")
+
+
+def text_row(values: Sequence[Any]) -> str:
+    """
+    Formats a row for Postgres ``COPY`` text format and MySQL ``LOAD DATA``:
+    tab separated, ``\\N`` for NULL and backslash escapes.
+    """
+    return "\t".join(_text_value(value) for value in values) + "\n"
+
+
+def _text_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    elif isinstance(value, (dict, list)):
+        value = dumps(value).decode()
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class BulkLoader:
+    """Generic loader: one ``INSERT`` executemany per batch, supported by every dialect."""
+
+    name = "executemany"
+    # Commit only once at the end of a copy unless checkpoints need intermediate commits.
+    single_transaction = False
+    # Whether several tables or chunks can be loaded into the target at the same time.
+    concurrent_writes = True
+
+    def supports(self, table: Table) -> bool:
+        return True
+
+    @contextmanager
+    def loading(self, connection: Connection) -> Generator[None, None, None]:
+        """Prepares a target connection for a bulk load and restores it afterwards."""
+        yield
+
+    def load(self, connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]) -> None:
+        connection.execute(insert(table), rows)
+
+
+class PostgresCopyLoader(BulkLoader):
+    """Streams batches through ``COPY ... FROM STDIN`` (psycopg2) from an in-memory text buffer."""
+
+    name = "copy"
+
+    def supports(self, table: Table) -> bool:
+        # Array literals need their own text format, leave them to executemany.
+        return not any(isinstance(column.type, ARRAY) for column in table.columns)
+
+    def load(self, connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]) -> None:
+        if not self.supports(table):
+            return super().load(connection, table, rows)
+        keys = list(rows[0])
+        buffer = io.StringIO("".join(text_row([row[key] for key in keys]) for row in rows))
+
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(table.c[key].name) for key in keys)
+        cursor = connection.connection.dbapi_connection.cursor()  # type: ignore
+        try:
+            cursor.copy_expert(f"COPY {preparer.format_table(table)} ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+
+
+class MySQLLoader(BulkLoader):
+    """
+    Writes batches as multi-row ``INSERT ... VALUES`` statements, or with
+    ``LOAD DATA LOCAL INFILE`` from a temporary file when ``local_infile`` is set
+    (the server and the driver, e.g. ``connect_args={"local_infile": True}``, must allow it).
+    """
+
+    name = "multi-values"
+
+    def __init__(self, rows_per_statement: int = 1000, local_infile: bool = False) -> None:
+        self.rows_per_statement = rows_per_statement
+        self.local_infile = local_infile
+        if local_infile:
+            self.name = "load-data"
+
+    def supports_infile(self, table: Table) -> bool:
+        # _Binary also covers the MySQL BLOB family, BINARY and VARBINARY, which aren't LargeBinary.
+        return not any(isinstance(column.type, sqltypes._Binary) for column in table.columns)
+
+    def load(self, connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]) -> None:
+        if self.local_infile and self.supports_infile(table):
+            return self._load_infile(connection, table, rows)
+        for start in range(0, len(rows), self.rows_per_statement):
+            connection.execute(insert(table).values(list(rows[start : start + self.rows_per_statement])))
+
+    def _load_infile(self, connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]) -> None:
+        keys = list(rows[0])
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(table.c[key].name) for key in keys)
+        fd, path = tempfile.mkstemp(suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+                file.writelines(text_row([row[key] for key in keys]) for row in rows)
+            connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {preparer.format_table(table)} "
+                "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                f"LINES TERMINATED BY '\\n' ({columns})"
+            )
+        finally:
+            os.remove(path)
+
+
+class SQLiteLoader(BulkLoader):
+    """
+    Loads in a single transaction with ``synchronous=OFF`` while loading.
+
+    SQLite allows one writer at a time and a load holds the write lock until
+    it commits, so the scheduler and chunker copy one table or chunk at a time
+    into a SQLite target.
+    """
+
+    name = "sqlite"
+    single_transaction = True
+    concurrent_writes = False
+
+    def __init__(self, wal: bool = False) -> None:
+        """
+        Args:
+            wal: Switch the target to WAL journaling while loading. The journal
+                mode is stored in the database file, it is restored afterwards
+                unless another connection still uses the file.
+        """
+        self.wal = wal
+
+    @contextmanager
+    def loading(self, connection: Connection) -> Generator[None, None, None]:
+        synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+        if self.wal:
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        connection.exec_driver_sql("PRAGMA synchronous=OFF")
+        try:
+            yield
+        except BaseException:
+            # The safety level can't be changed inside the failed load's transaction.
+            connection.rollback()
+            raise
+        finally:
+            connection.exec_driver_sql(f"PRAGMA synchronous={int(synchronous or 2)}")
+            if self.wal and str(journal_mode).lower() != "wal":
+                self._restore_journal_mode(connection, journal_mode)
+
+    @staticmethod
+    def _restore_journal_mode(connection: Connection, journal_mode: Any) -> None:
+        try:
+            connection.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+        except OperationalError as e:
+            logger.warning(f"Could not restore journal_mode={journal_mode}, the target stays in WAL mode: {e}")
+
+
+def get_loader(db: DatabaseInterface, **options: Any) -> BulkLoader:
+    """
+    Picks the fastest loader available for a target database.
+
+    Postgres uses COPY when the driver is psycopg2, MySQL uses multi-row
+    inserts (``local_infile=True`` switches to LOAD DATA), SQLite gets a tuned
+    single-transaction load (written by one table at a time) and anything else falls back to executemany.
+    """
+    dialect = db.engine.dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        loader: BulkLoader = PostgresCopyLoader()
+    elif dialect.name == "mysql":
+        loader = MySQLLoader(**options)
+    elif dialect.name == "sqlite":
+        loader = SQLiteLoader()
+    else:
+        loader = BulkLoader()
+    logger.debug(f"Using {loader.name} loader for {dialect.name}+{dialect.driver}")
+    return loader
+
@@ -0,0 +1,341 @@
+from copy import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    REAL,
+    BigInteger,
+    Column,
+    DateTime,
+    Double,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    Interval,
+    LargeBinary,
+    MetaData,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    Time,
+)
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.exc import CompileError, UnsupportedCompilationError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+from sqlalchemy.types import TypeEngine
+
+from contrib.generator.sqlmodel import convert_column_name, convert_table_name
+
+from .copy import get_database, logger
+
+
+@dataclass
+class SchemaChange:
+    """One step of a schema plan, with the DDL bringing the target in line with the source."""
+
+    kind: str  # add_table, add_column, drop_column, alter_type or add_index
+    table: str
+    name: Optional[str] = None
+    detail: str = ""
+    ddl: List[str] = field(default_factory=list)
+    # Dropping a column loses data, such changes are only applied on request.
+    destructive: bool = False
+
+    def __str__(self) -> str:
+        target = f"{self.table}.{self.name}" if self.name else self.table
+        return f"{self.kind} {target}" + (f" ({self.detail})" if self.detail else "")
+
+
+@dataclass
+class SchemaPlan:
+    changes: List[SchemaChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __str__(self) -> str:
+        return "\n".join(str(change) for change in self.changes) or "No schema changes"
+
+    def statements(self, destructive: bool = False) -> List[str]:
+        return [ddl for change in self.changes if destructive or not change.destructive for ddl in change.ddl]
+
+    def apply(self, connection: Connection, destructive: bool = False) -> None:
+        """
+        Executes the plan on the target. Changes without DDL (e.g. type changes
+        SQLite can't ``ALTER``) are logged and left for a manual migration.
+
+        Args:
+            connection: A target connection, the caller owns the transaction.
+            destructive: Also drop removed columns.
+        """
+        for change in self.changes:
+            if change.destructive and not destructive:
+                logger.info(f"Skipping destructive change {change}")
+                continue
+            if not change.ddl:
+                logger.warning(f"No DDL for {change}, migrate it manually")
+            for ddl in change.ddl:
+                connection.exec_driver_sql(ddl)
+
+
+def _type_key(type_: TypeEngine, dialect: Dialect) -> str:
+    try:
+        compiled = type_.compile(dialect=dialect)
+    except (CompileError, UnsupportedCompilationError):
+        compiled = _generic(type_).compile(dialect=dialect)
+    return " ".join(compiled.upper().split())
+
+
+# Storage size in bytes of the integer types, unsigned MySQL integers need the next size up.
+_INTEGER_BYTES = {"TINYINT": 1, "SMALLINT": 2, "SmallInteger": 2, "MEDIUMINT": 3, "BIGINT": 8, "BigInteger": 8}
+_UNSIGNED_BYTES = {1: 2, 2: 3, 3: 4, 4: 8}
+
+
+def _generic(type_: TypeEngine) -> TypeEngine:
+    """Returns the dialect-neutral form of a type, without collation, and enums as strings."""
+    try:
+        generic = type_.as_generic()
+    except NotImplementedError:
+        # e.g. MySQL LONGBLOB, YEAR or BIT
+        if isinstance(type_, LargeBinary):
+            return LargeBinary()
+        try:
+            python_type = type_.python_type
+        except NotImplementedError:
+            return type_
+        return {int: Integer(), bytes: LargeBinary(), str: String()}.get(python_type, type_)
+    if isinstance(generic, Enum):
+        return String(generic.length)
+    if isinstance(generic, String) and type(type_).__name__.endswith("TEXT") and not isinstance(generic, Text):
+        # MySQL MEDIUMTEXT and LONGTEXT, a VARCHAR without length isn't valid everywhere.
+        return Text()
+    if isinstance(generic, Double):
+        # Postgres reflects DOUBLE PRECISION with precision 53, MySQL won't take a precision without scale.
+        return Double(asdecimal=generic.asdecimal)
+    if isinstance(generic, String) and generic.collation:
+        generic = copy(generic)
+        generic.collation = None
+    return generic
+
+
+def _integer_bytes(type_: TypeEngine) -> int:
+    size = next((_INTEGER_BYTES[klass.__name__] for klass in type(type_).__mro__ if klass.__name__ in _INTEGER_BYTES), 4)
+    return _UNSIGNED_BYTES.get(size, size) if getattr(type_, "unsigned", False) else size
+
+
+def _float_bytes(type_: TypeEngine) -> int:
+    if isinstance(type_, Double) or any("DOUBLE" in klass.__name__ for klass in type(type_).__mro__):
+        return 8
+    if getattr(type_, "precision", None):
+        return 8 if type_.precision > 24 else 4  # type: ignore
+    # A bare FLOAT is single precision on MySQL, double precision on Postgres.
+    return 4 if isinstance(type_, REAL) or type(type_).__module__.startswith("sqlalchemy.dialects.mysql") else 8
+
+
+def _fits(source: TypeEngine, target: TypeEngine) -> bool:
+    """
+    Whether every value of the source type fits the target column as it is.
+
+    Types are compared on affinity and size (length, precision and scale, integer
+    and float width, time zone), not on their spelling, so a MySQL ``DATETIME``
+    fits a Postgres ``TIMESTAMP`` and a ``TINYINT`` an ``INTEGER``.
+    """
+    source_generic, target_generic = _generic(source), _generic(target)
+    if source_generic._type_affinity is not target_generic._type_affinity:
+        return False
+    if isinstance(source_generic, Integer):
+        return _integer_bytes(source) <= _integer_bytes(target)
+    if isinstance(source_generic, Float) or isinstance(target_generic, Float):
+        if not (isinstance(source_generic, Float) and isinstance(target_generic, Float)):
+            return False
+        return _float_bytes(source) <= _float_bytes(target)
+    if isinstance(source_generic, Numeric):
+        if target_generic.precision is None:  # type: ignore
+            return True
+        if source_generic.precision is None:
+            return False
+        source_scale, target_scale = source_generic.scale or 0, target_generic.scale or 0  # type: ignore
+        return (
+            source_scale <= target_scale
+            and source_generic.precision - source_scale <= target_generic.precision - target_scale  # type: ignore
+        )
+    if isinstance(source_generic, (String, LargeBinary)):
+        target_length = target_generic.length  # type: ignore
+        return target_length is None or (source_generic.length is not None and source_generic.length <= target_length)
+    if isinstance(source_generic, (DateTime, Time)):
+        return not source_generic.timezone or bool(target_generic.timezone)  # type: ignore
+    return True
+
+
+def _portable_type(type_: TypeEngine, dialect: Dialect) -> TypeEngine:
+    """
+    Returns the type as the target dialect accepts it: types of the target
+    dialect as they are, others in their generic form, e.g. a MySQL
+    ``DATETIME`` becomes ``DateTime`` and an unsigned ``INT`` a ``BigInteger``.
+    """
+    package = "mysql" if dialect.name == "mariadb" else dialect.name
+    if type(type_).__module__.startswith(f"sqlalchemy.dialects.{package}."):
+        return type_
+    generic = _generic(type_)
+    if isinstance(generic, Integer):
+        size = _integer_bytes(type_)
+        return SmallInteger() if size <= 2 else Integer() if size <= 4 else BigInteger()
+    if isinstance(generic, Interval) and type(dialect.type_descriptor(generic)) is Interval:
+        # Without a native INTERVAL, SQLAlchemy emulates it as a DATETIME past the epoch; keep the durations as text.
+        return String(64)
+    try:
+        generic.compile(dialect=dialect)
+    except (CompileError, UnsupportedCompilationError):
+        # No equivalent on the target (e.g. an ARRAY, or a VARCHAR without length on MySQL), keep the values as text.
+        return Text()
+    return generic
+
+
+class SchemaPlanner:
+    def __init__(self, dialect: Dialect, *, table_map: Optional[Dict[str, str]] = None) -> None:
+        """
+        Compares a source schema with an existing target schema and plans the
+        smallest set of DDL bringing the target up to date, instead of dropping
+        and re-creating populated tables.
+
+        Tables and columns are matched by name, or by the name the model
+        generator gives them. A column type only changes when the target can't
+        hold the source values; defaults and constraints other than indexes are
+        left alone.
+
+        Args:
+            dialect: The dialect of the target database.
+            table_map: Optional mapping of source table name to target table name.
+        """
+        self.dialect = dialect
+        self.table_map = table_map or {}
+        self.preparer = dialect.identifier_preparer
+
+    def target_table(self, source: Table, target: MetaData) -> Optional[Table]:
+        candidates = [self.table_map.get(source.name), source.name, convert_table_name(source.name).lower()]
+        return next((target.tables[name] for name in candidates if name in target.tables), None)
+
+    def plan(self, source: MetaData, target: MetaData, tables: Optional[Iterable[str]] = None) -> SchemaPlan:
+        """
+        Plans the changes of the source tables, or only of the given table names.
+
+        Returns:
+            The plan, empty when the target is up to date. New tables come parents first.
+        """
+        names = set(tables) if tables is not None else None
+        # New tables are rendered from a copy, so foreign keys resolve and types can be made portable.
+        portable = MetaData()
+        for table in source.sorted_tables:
+            for column in table.to_metadata(portable).columns:
+                column.type = _portable_type(column.type, self.dialect)
+        plan = SchemaPlan()
+        for table in source.sorted_tables:
+            if names is not None and table.name not in names:
+                continue
+            target_table = self.target_table(table, target)
+            if target_table is None:
+                plan.changes.append(self.add_table(portable.tables[table.key]))
+            else:
+                plan.changes.extend(self.diff_table(table, target_table))
+        return plan
+
+    def add_table(self, table: Table) -> SchemaChange:
+        ddl = [str(CreateTable(table).compile(dialect=self.dialect)).strip()]
+        ddl += [str(CreateIndex(index).compile(dialect=self.dialect)) for index in table.indexes]
+        return SchemaChange("add_table", table.name, ddl=ddl)
+
+    def diff_table(self, source: Table, target: Table) -> List[SchemaChange]:
+        changes: List[SchemaChange] = []
+        table = self.preparer.format_table(target)
+        by_name = {column.name: column for column in target.columns}
+        matched = set()
+        for column in source.columns:
+            target_column = by_name.get(column.name, by_name.get(convert_column_name(column.name)))
+            if target_column is None:
+                changes.append(self.add_column(target, column))
+                continue
+            matched.add(target_column.name)
+            # Compared as the target would store it, so columns made portable once aren't altered on every plan.
+            new_type = _portable_type(column.type, self.dialect)
+            if not _fits(new_type, target_column.type):
+                changes.append(self.alter_type(target, target_column, new_type))
+        for column in target.columns:
+            if column.name not in matched:
+                ddl = f"ALTER TABLE {table} DROP COLUMN {self.preparer.quote(column.name)}"
+                changes.append(SchemaChange("drop_column", target.name, column.name, ddl=[ddl], destructive=True))
+        changes.extend(self.add_indexes(source, target))
+        return changes
+
+    def add_column(self, target: Table, column: Column) -> SchemaChange:
+        # Existing rows have no value for a NOT NULL column without default, the next copy fills it in.
+        nullable = column.nullable or column.server_default is None
+        detail = "" if nullable == column.nullable else "added as NULL, NOT NULL in the source"
+        new = Column(
+            convert_column_name(column.name),
+            _portable_type(column.type, self.dialect),
+            nullable=nullable,
+            server_default=column.server_default,
+        )
+        Table(target.name, MetaData(), new)
+        spec = CreateColumn(new).compile(dialect=self.dialect)
+        ddl = f"ALTER TABLE {self.preparer.format_table(target)} ADD COLUMN {spec}"
+        return SchemaChange("add_column", target.name, new.name, detail, [ddl])
+
+    def alter_type(self, target: Table, column: Column, new_type: TypeEngine) -> SchemaChange:
+        table, name = self.preparer.format_table(target), self.preparer.quote(column.name)
+        type_ = new_type.compile(dialect=self.dialect)
+        detail = f"{_type_key(column.type, self.dialect)} -> {type_}"
+        if self.dialect.name == "postgresql":
+            ddl = [f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {type_} USING {name}::{type_}"]
+        elif self.dialect.name in ("mysql", "mariadb"):
+            # MODIFY replaces the whole definition, AUTO_INCREMENT, DEFAULT and COMMENT are dropped unless repeated.
+            definition = column._copy()
+            definition.type = new_type
+            Table(target.name, MetaData(), definition)
+            ddl = [f"ALTER TABLE {table} MODIFY COLUMN {CreateColumn(definition).compile(dialect=self.dialect)}"]
+        else:
+            # SQLite can't change a column type without rebuilding the table.
+            ddl = []
+        return SchemaChange("alter_type", target.name, column.name, detail, ddl)
+
+    def add_indexes(self, source: Table, target: Table) -> List[SchemaChange]:
+        def signature(index: Index) -> Any:
+            return tuple(convert_column_name(column.name) for column in index.columns), bool(index.unique)
+
+        existing = {signature(index) for index in target.indexes}
+        changes = []
+        for index in sorted(source.indexes, key=lambda index: index.name or ""):
+            if signature(index) in existing:
+                continue
+            columns = ", ".join(self.preparer.quote(name) for name in signature(index)[0])
+            unique = "UNIQUE " if index.unique else ""
+            name = self.preparer.quote(index.name or f"ix_{target.name}_{'_'.join(signature(index)[0])}")
+            ddl = f"CREATE {unique}INDEX {name} ON {self.preparer.format_table(target)} ({columns})"
+            changes.append(SchemaChange("add_index", target.name, index.name, ddl=[ddl]))
+        return changes
+
+
+def plan_migration(source: Any, target: Any, tables: Optional[Iterable[str]] = None, **options: Any) -> SchemaPlan:
+    """
+    Plans the schema changes between a source and a target SQLBlock or
+    DatabaseInterface, reflecting both databases as they are now.
+
+    Args:
+        source: The source SQLBlock or DatabaseInterface.
+        target: The target SQLBlock or DatabaseInterface.
+        tables: Optional source table names to compare, all tables by default.
+        options: Passed to SchemaPlanner, e.g. ``table_map``.
+
+    Returns:
+        The plan, to be reviewed or applied with ``plan.apply(connection)``.
+    """
+    source, target = get_database(source), get_database(target)
+    source_metadata, target_metadata = MetaData(), MetaData()
+    source_metadata.reflect(source.engine, only=list(tables) if tables is not None else None)
+    target_metadata.reflect(target.engine)
+    plan = SchemaPlanner(target.engine.dialect, **options).plan(source_metadata, target_metadata, tables)
+    logger.info(f"Schema plan: {len(plan.changes)} change(s)")
+    return plan
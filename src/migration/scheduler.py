@@ -0,0 +1,156 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import MetaData, Table
+
+from .copy import CopyStats, TableCopier, logger, resolve_table
+
+if TYPE_CHECKING:
+    from .chunker import PrimaryKeyChunker
+
+
+def dependency_graph(tables: Iterable[Table]) -> Dict[str, Set[str]]:
+    """
+    Builds the foreign-key dependency graph of a set of tables.
+
+    Self references and references to tables outside the set are ignored.
+
+    Returns:
+        A mapping of table name to the names of the tables it references.
+    """
+    tables = list(tables)
+    names = {table.name for table in tables}
+    graph: Dict[str, Set[str]] = {}
+    for table in tables:
+        parents = {fk.column.table.name for fk in table.foreign_keys}
+        graph[table.name] = (parents & names) - {table.name}
+    return graph
+
+
+class MigrationScheduler:
+    def __init__(
+        self,
+        copier: TableCopier,
+        *,
+        max_workers: int = 4,
+        table_map: Optional[Dict[str, Any]] = None,
+        chunker: Optional["PrimaryKeyChunker"] = None,
+        chunked: Iterable[str] = (),
+    ) -> None:
+        """
+        Copies many tables concurrently, starting a table only once its parents are copied.
+
+        Every running table holds one connection from each engine's pool, so
+        ``max_workers`` should not exceed the pool size of either database.
+        Targets allowing a single writer (SQLite) are loaded one table at a time.
+
+        Args:
+            copier: The copier used for every table.
+            max_workers: Number of tables copied at the same time.
+            table_map: Optional mapping of source table name to target Table, SQLModel class or name.
+            chunker: Optional chunker used to split the ``chunked`` tables across its own workers.
+            chunked: Names of the large tables copied through ``chunker``.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        if max_workers > 1 and not copier.loader.concurrent_writes:
+            logger.warning(f"{copier.loader.name} loader writes one table at a time, ignoring max_workers={max_workers}")
+            max_workers = 1
+        self.copier = copier
+        self.max_workers = max_workers
+        self.table_map = table_map or {}
+        self.chunker = chunker
+        self.chunked = set(chunked)
+        if self.chunked and chunker is None:
+            raise ValueError("chunked tables need a chunker")
+        self.results: Dict[str, CopyStats] = {}
+        self.failed: Dict[str, BaseException] = {}
+        self.skipped: Set[str] = set()
+
+    @property
+    def metadata(self) -> MetaData:
+        """The source metadata, holding every source table."""
+        source = self.copier.source
+        # Reflection is additive: tables already known (e.g. reflected by a block) are kept as they are,
+        # the missing ones are added, so a partly populated MetaData never hides tables.
+        source.metadata.reflect(source.engine)
+        return source.metadata
+
+    def source_tables(self, names: Optional[Iterable[str]] = None) -> List[Table]:
+        if names is None:
+            return list(self.metadata.sorted_tables)
+        return [resolve_table(self.copier.source, name) for name in names]
+
+    def run(self, names: Optional[Iterable[str]] = None) -> Dict[str, CopyStats]:
+        """
+        Copies the given source tables, or every reflected table.
+
+        A table whose copy fails is reported and its dependants are skipped,
+        while independent tables keep going.
+
+        Returns:
+            The copy statistics per source table name.
+
+        Raises:
+            RuntimeError: If at least one table failed.
+        """
+        tables = {table.name: table for table in self.source_tables(names)}
+        # Resolve (and possibly reflect) target tables up front: MetaData is not thread-safe.
+        targets = {
+            name: resolve_table(self.copier.target, self.table_map.get(name, name)) for name in tables
+        }
+        graph = dependency_graph(tables.values())
+        children: Dict[str, Set[str]] = {name: set() for name in graph}
+        for name, parents in graph.items():
+            for parent in parents:
+                children[parent].add(name)
+        waiting = {name: set(parents) for name, parents in graph.items()}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="migration") as executor:
+            running: Dict[Future, str] = {}
+
+            def submit_ready():
+                ready = [name for name, parents in waiting.items() if not parents]
+                if not ready and not running and waiting:
+                    # Only cycles are left; copy them in sorted order and let the target complain if needed.
+                    ready = [next(iter(waiting))]
+                    logger.warning(f"Foreign key cycle detected, forcing {ready[0]}")
+                for name in ready:
+                    del waiting[name]
+                    running[executor.submit(self.copy, tables[name], targets[name])] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        self.results[name] = future.result()
+                        for child in children[name]:
+                            if child in waiting:
+                                waiting[child].discard(name)
+                    else:
+                        logger.error(f"Copy of {name} failed: {error}")
+                        self.failed[name] = error
+                        self._skip_descendants(name, children, waiting)
+                submit_ready()
+
+        if self.failed:
+            raise RuntimeError(
+                f"Migration failed for {sorted(self.failed)}; skipped dependants {sorted(self.skipped)}"
+            )
+        return self.results
+
+    def copy(self, table: Table, target_table: Table) -> CopyStats:
+        if table.name in self.chunked:
+            return self.chunker.run(table, target_table)  # type: ignore
+        return self.copier.copy_table(table, target_table)
+
+    def _skip_descendants(self, name: str, children: Dict[str, Set[str]], waiting: Dict[str, Set[str]]) -> None:
+        for child in children[name]:
+            if child in waiting:
+                del waiting[child]
+                self.skipped.add(child)
+                logger.warning(f"Skipping {child}, parent {name} failed")
+                self._skip_descendants(child, children, waiting)
@@ -0,0 +1,15 @@
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# core reads its settings and setup config at import time.
+os.environ.setdefault("APP_NAME", "marco-tests")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+_config_path = os.path.join(ROOT, "storages", "setup", "config.json")
+if not os.path.isfile(_config_path):
+    os.makedirs(os.path.dirname(_config_path), exist_ok=True)
+    with open(_config_path, mode="w", encoding="utf-8") as f:
+        json.dump({"tests": True}, f)
+
+import core  # noqa: E402,F401  # imported first, internal alone is a circular import
@@ -0,0 +1,57 @@
+import sys
+
+import sqlalchemy
+from sqlalchemy import JSON, Column, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.dialects import postgresql
+
+from contrib.generator.sqlmodel import SQLModelGenerator, sa_type_of
+
+
+def make_generator(tmp_path, metadata: MetaData) -> SQLModelGenerator:
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    metadata.create_all(engine)
+    return SQLModelGenerator(str(tmp_path / "models.py"), engine, MetaData(), schema_cache=None)
+
+
+def test_build_module_with_json_column(tmp_path):
+    metadata = MetaData()
+    Table(
+        "documents",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("body", JSON),
+        Column("tags", JSON, nullable=False),
+        Column("title", String(50)),
+    )
+    module = make_generator(tmp_path, metadata).build_module("tests._generated_json", register=False)
+
+    table = module.Documents.__table__
+    assert isinstance(table.c.body.type, JSON)
+    assert table.c.body.nullable
+    assert isinstance(table.c.tags.type, JSON)
+    assert not table.c.tags.nullable
+    document = module.Documents(id=1, body={"a": [1, 2]}, tags=["x"], title="t")
+    assert document.body == {"a": [1, 2]}
+
+
+def test_sa_type_of_container_types():
+    assert sa_type_of(JSON()) == "sqlalchemy.JSON"
+    assert sa_type_of(postgresql.JSONB()) == "postgresql.JSONB"
+    assert sa_type_of(postgresql.HSTORE()) == "postgresql.HSTORE"
+    assert sa_type_of(postgresql.ARRAY(postgresql.INTEGER)) == "sqlalchemy.ARRAY(sqlalchemy.Integer)"
+    assert sa_type_of(sqlalchemy.ARRAY(String, dimensions=2)) == "sqlalchemy.ARRAY(sqlalchemy.String, dimensions=2)"
+    assert sa_type_of(String()) is None
+
+
+def test_build_module_per_name(tmp_path):
+    metadata = MetaData()
+    Table("documents", metadata, Column("id", Integer, primary_key=True), Column("title", String(50)))
+    generator = make_generator(tmp_path, metadata)
+
+    first = generator.build_module("tests._generated_first", register=False)
+    second = generator.build_module("tests._generated_second", register=False)
+    assert first is not second
+    assert (first.__name__, second.__name__) == ("tests._generated_first", "tests._generated_second")
+    assert generator.build_module("tests._generated_first", register=False) is first
+    assert "tests._generated_first" not in sys.modules
+    assert "tests._generated_second" not in sys.modules
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.dialects import mysql
+
+from src.migration.loaders import MySQLLoader
+
+
+def test_supports_infile_rejects_reflected_blob(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'loaders.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE files (id INTEGER PRIMARY KEY, name VARCHAR(50), body BLOB)"))
+    table = Table("files", MetaData(), autoload_with=engine)
+    assert not MySQLLoader(local_infile=True).supports_infile(table)
+
+
+@pytest.mark.parametrize(
+    "type_", [mysql.TINYBLOB(), mysql.MEDIUMBLOB(), mysql.LONGBLOB(), mysql.BINARY(16), mysql.VARBINARY(255)]
+)
+def test_supports_infile_rejects_mysql_binary_types(type_):
+    table = Table("files", MetaData(), Column("id", Integer, primary_key=True), Column("body", type_))
+    assert not MySQLLoader(local_infile=True).supports_infile(table)
+
+
+def test_supports_infile_accepts_text_columns():
+    table = Table("files", MetaData(), Column("id", Integer, primary_key=True), Column("name", String(50)))
+    assert MySQLLoader(local_infile=True).supports_infile(table)
@@ -0,0 +1,143 @@
+from sqlalchemy import Column, ForeignKey, MetaData, Table, text
+from sqlalchemy.dialects import mysql, postgresql
+
+from src.migration.planner import SchemaPlanner
+
+
+def mysql_source() -> MetaData:
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", mysql.INTEGER(unsigned=True), primary_key=True),
+        Column("name", mysql.VARCHAR(255, collation="utf8mb4_unicode_ci")),
+        Column("bio", mysql.LONGTEXT()),
+        Column("score", mysql.DOUBLE()),
+        Column("level", mysql.TINYINT()),
+        Column("rank", mysql.SMALLINT()),
+        Column("balance", mysql.DECIMAL(12, 2)),
+        Column("state", mysql.ENUM("active", "disabled")),
+        Column("avatar", mysql.LONGBLOB()),
+        Column("created_at", mysql.DATETIME()),
+    )
+    Table(
+        "posts",
+        metadata,
+        Column("id", mysql.BIGINT(), primary_key=True),
+        Column("user_id", mysql.INTEGER(unsigned=True), ForeignKey("users.id")),
+        Column("title", mysql.VARCHAR(200)),
+    )
+    return metadata
+
+
+def postgres_target() -> MetaData:
+    """The users table as reflected from Postgres after a previous migration."""
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", postgresql.BIGINT(), primary_key=True),
+        Column("name", postgresql.VARCHAR(255)),
+        Column("bio", postgresql.TEXT()),
+        Column("score", postgresql.DOUBLE_PRECISION(precision=53)),
+        Column("level", postgresql.INTEGER()),
+        Column("rank", postgresql.INTEGER()),
+        Column("balance", postgresql.NUMERIC(10, 2)),
+        Column("state", postgresql.VARCHAR(8)),
+        Column("avatar", postgresql.BYTEA()),
+        Column("created_at", postgresql.TIMESTAMP()),
+    )
+    return metadata
+
+
+def test_mysql_to_postgres_plan_only_changes_what_doesnt_fit():
+    plan = SchemaPlanner(postgresql.dialect()).plan(mysql_source(), postgres_target())
+
+    changes = {(change.kind, change.table, change.name) for change in plan.changes}
+    assert changes == {("alter_type", "users", "balance"), ("add_table", "posts", None)}
+    assert 'ALTER TABLE users ALTER COLUMN balance TYPE NUMERIC(12, 2) USING balance::NUMERIC(12, 2)' in plan.statements()
+
+
+def test_mysql_to_postgres_new_table_uses_postgres_types():
+    plan = SchemaPlanner(postgresql.dialect()).plan(mysql_source(), MetaData())
+
+    ddl = "\n".join(plan.statements())
+    for mysql_only in ("DATETIME", "DOUBLE,", "TINYINT", "LONGTEXT", "LONGBLOB", "COLLATE", "ENUM", "UNSIGNED"):
+        assert mysql_only not in ddl
+    assert "id BIGSERIAL NOT NULL" in ddl  # INT UNSIGNED needs 8 bytes
+    assert "user_id BIGINT" in ddl
+    assert "bio TEXT" in ddl
+    assert "created_at TIMESTAMP WITHOUT TIME ZONE" in ddl
+    assert "score DOUBLE PRECISION" in ddl
+    assert "avatar BYTEA" in ddl
+
+
+def test_narrower_target_types_are_altered():
+    target = postgres_target()
+    target.tables["users"].c.name.type = postgresql.VARCHAR(100)
+    target.tables["users"].c.id.type = postgresql.INTEGER()
+    plan = SchemaPlanner(postgresql.dialect()).plan(mysql_source(), target, tables=["users"])
+
+    statements = plan.statements()
+    assert "ALTER TABLE users ALTER COLUMN name TYPE VARCHAR(255) USING name::VARCHAR(255)" in statements
+    assert "ALTER TABLE users ALTER COLUMN id TYPE BIGINT USING id::BIGINT" in statements
+
+
+def postgres_source() -> MetaData:
+    metadata = MetaData()
+    Table(
+        "events",
+        metadata,
+        Column("id", postgresql.BIGINT(), primary_key=True),
+        Column("name", postgresql.VARCHAR()),
+        Column("code", postgresql.VARCHAR(20)),
+        Column("duration", postgresql.INTERVAL()),
+        Column("tags", postgresql.ARRAY(postgresql.INTEGER())),
+        Column("payload", postgresql.JSONB()),
+        Column("views", postgresql.BIGINT(), nullable=False),
+    )
+    return metadata
+
+
+def mysql_target() -> MetaData:
+    """The events table as reflected from MySQL after a previous migration, with a narrower views column."""
+    metadata = MetaData()
+    Table(
+        "events",
+        metadata,
+        Column("id", mysql.BIGINT(), primary_key=True, autoincrement=True, comment="event id"),
+        Column("name", mysql.TEXT()),
+        Column("code", mysql.VARCHAR(20)),
+        Column("duration", mysql.VARCHAR(64)),
+        Column("tags", mysql.TEXT()),
+        Column("payload", mysql.JSON()),
+        Column("views", mysql.INTEGER(), nullable=False, server_default=text("0"), comment="page views"),
+    )
+    return metadata
+
+
+def test_postgres_to_mysql_new_table_uses_text_for_types_without_equivalent():
+    plan = SchemaPlanner(mysql.dialect()).plan(postgres_source(), MetaData())
+
+    ddl = "\n".join(plan.statements())
+    assert "name TEXT" in ddl  # a VARCHAR without length isn't valid on MySQL
+    assert "code VARCHAR(20)" in ddl
+    assert "duration VARCHAR(64)" in ddl  # not DATETIME
+    assert "tags TEXT" in ddl
+    assert "payload JSON" in ddl
+
+
+def test_postgres_to_mysql_plan_only_changes_what_doesnt_fit():
+    plan = SchemaPlanner(mysql.dialect()).plan(postgres_source(), mysql_target())
+
+    assert [(change.kind, change.name) for change in plan.changes] == [("alter_type", "views")]
+
+
+def test_mysql_alter_type_keeps_the_column_definition():
+    target = mysql_target()
+    target.tables["events"].c.id.type = mysql.INTEGER()
+    plan = SchemaPlanner(mysql.dialect()).plan(postgres_source(), target)
+
+    statements = plan.statements()
+    assert "ALTER TABLE events MODIFY COLUMN id BIGINT NOT NULL COMMENT 'event id' AUTO_INCREMENT" in statements
+    assert "ALTER TABLE events MODIFY COLUMN views BIGINT NOT NULL COMMENT 'page views' DEFAULT 0" in statements
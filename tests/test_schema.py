@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table, create_engine, inspect
+from sqlalchemy.exc import OperationalError
+
+from internal.databases.schema import create_tables
+
+
+def make_tables() -> MetaData:
+    metadata = MetaData()
+    Table("parents", metadata, Column("id", Integer, primary_key=True))
+    Table("children", metadata, Column("id", Integer, primary_key=True), Column("parent_id", ForeignKey("parents.id")))
+    return metadata
+
+
+def test_create_tables_parents_first(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    metadata = make_tables()
+    with engine.begin() as connection:
+        created, deferred = create_tables(connection, reversed(metadata.sorted_tables))
+    assert [table.name for table in created] == ["parents", "children"]
+    assert deferred == []
+    assert set(inspect(engine).get_table_names()) == {"parents", "children"}
+
+
+def test_create_tables_rolls_back_on_failure(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    metadata = make_tables()
+    with engine.begin() as connection:
+        metadata.tables["children"].create(connection)
+    # "parents" is created first, then "children" fails as it already exists.
+    with pytest.raises(OperationalError):
+        with engine.begin() as connection:
+            create_tables(connection, metadata.sorted_tables, checkfirst=False)
+    assert inspect(engine).get_table_names() == ["children"]
@@ -1,6 +1,5 @@
 import logging
 import os
-import time
 
 from core import LOG_DIR
 
@@ -37,21 +36,3 @@ def get_file_size(filename: str) -> int:
     else:
         return -1
 
-
-def wait_for_generation(file_path, timeout=1):
-    """
-    Waits for a file to finish generating or updating by periodically checking its size.
-
-    Args:
-        file_path (str): The path to the file.
-        timeout (int, optional): The time in seconds to wait between checks. Defaults to 1.
-
-    Returns:
-        bool: True if the file has finished generating or updating, False otherwise.
-    """
-    current_size = get_file_size(file_path)
-    time.sleep(timeout)
-    while current_size != get_file_size(file_path) or get_file_size(file_path) == 0:
-        current_size = get_file_size(file_path)
-        time.sleep(timeout)
-    return True